@@ -0,0 +1,113 @@
+"""Differential check and benchmark of the native Hebrew calendar against hdate.
+
+Usage:
+    python benchmarks/hebcal.py verify --start 3762 --end 7000
+    python benchmarks/hebcal.py bench
+
+`verify` compares leap years, year lengths, month lengths, every Hebrew to
+Gregorian conversion (including invalid days) and every Gregorian day of each
+year in the range.  `bench` times the conversions the sensors perform.
+tests/test_hebcal.py runs the comparison over a bounded range of years.
+"""
+import argparse
+from datetime import date
+import importlib.util
+from pathlib import Path
+import sys
+import timeit
+
+from hdate import HebrewDate
+from hdate.hebrew_date import is_leap_year
+
+# hebcal is self-contained, load it without importing Home Assistant
+_SPEC = importlib.util.spec_from_file_location(
+    "hebcal",
+    Path(__file__).resolve().parent.parent / "custom_components" / "anniversaries" / "hebcal.py",
+)
+hebcal = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(hebcal)
+
+
+def _hdate_ordinal(year, month, day):
+    try:
+        return HebrewDate(year=year, month=month, day=day).to_gdate().toordinal()
+    except ValueError:
+        return None
+
+
+def _native_ordinal(year, month, day):
+    try:
+        return hebcal.to_ordinal(year, month, day)
+    except ValueError:
+        return None
+
+
+def verify(start, end):
+    """Compare the native engine with hdate for every year in [start, end)."""
+    for year in range(start, end):
+        assert hebcal.is_leap_year(year) == is_leap_year(year), year
+        assert hebcal.year_length(year) == HebrewDate.year_size(year), year
+        for month in range(1, 15):
+            for day in (1, 29, 30, 31):
+                expected = _hdate_ordinal(year, month, day)
+                assert _native_ordinal(year, month, day) == expected, (year, month, day)
+        first = hebcal.rosh_hashana(year)
+        for ordinal in range(first, first + hebcal.year_length(year)):
+            expected = HebrewDate.from_gdate(date.fromordinal(ordinal))
+            assert hebcal.from_ordinal(ordinal) == (expected.year, int(expected.month), expected.day), ordinal
+        if year % 100 == 0:
+            print(f"verified up to {year}", file=sys.stderr)
+    print(f"native engine matches hdate for Hebrew years {start}-{end - 1}")
+
+
+def bench(number):
+    """Time Hebrew to Gregorian and Gregorian to Hebrew conversions."""
+    years = range(5700, 5800)
+    ordinals = range(date(1950, 1, 1).toordinal(), date(2040, 1, 1).toordinal(), 97)
+
+    def native_to():
+        for year in years:
+            hebcal.to_ordinal(year, 9, 15)
+
+    def hdate_to():
+        for year in years:
+            HebrewDate(year=year, month=9, day=15).to_gdate()
+
+    def native_from():
+        for ordinal in ordinals:
+            hebcal.from_ordinal(ordinal)
+
+    def hdate_from():
+        # from_gdate is lru_cached inside hdate, bypass it to time the conversion itself
+        for ordinal in ordinals:
+            HebrewDate.from_jdn.__wrapped__(ordinal + 1_721_425)
+
+    for name, native, library, count in (
+        ("hebrew -> gregorian", native_to, hdate_to, len(years)),
+        ("gregorian -> hebrew", native_from, hdate_from, len(ordinals)),
+    ):
+        native_time = min(timeit.repeat(native, number=number, repeat=3)) / (number * count)
+        hdate_time = min(timeit.repeat(library, number=number, repeat=3)) / (number * count)
+        print(
+            f"{name}: native {native_time * 1e6:.2f} us, hdate {hdate_time * 1e6:.2f} us, "
+            f"speedup {hdate_time / native_time:.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify_parser = sub.add_parser("verify")
+    verify_parser.add_argument("--start", type=int, default=3762)
+    verify_parser.add_argument("--end", type=int, default=7000)
+    bench_parser = sub.add_parser("bench")
+    bench_parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    if args.command == "verify":
+        verify(args.start, args.end)
+    else:
+        bench(args.number)
+
+
+if __name__ == "__main__":
+    main()
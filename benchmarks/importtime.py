@@ -0,0 +1,103 @@
+"""Measure the import time of the integration against a budget.
+
+Usage:
+    python benchmarks/importtime.py --budget-ms 250
+
+Imports the integration's modules in a fresh interpreter run with
+`-X importtime`, after the Home Assistant modules they use have been imported,
+so only the integration and its own requirements are counted.  Reports the
+cumulative time of each module and whether hdate or dateutil were pulled in,
+and exits non-zero if the total is over the budget.  tests/test_importtime.py
+runs the same check.  Requires `homeassistant`.
+"""
+import argparse
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules Home Assistant has already imported by the time it loads the integration
+PREIMPORTED = (
+    "homeassistant.config_entries",
+    "homeassistant.components.calendar",
+    "homeassistant.components.sensor",
+    "homeassistant.const",
+    "homeassistant.core",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.discovery",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.selector",
+    "homeassistant.helpers.template",
+    "homeassistant.util.dt",
+)
+
+MODULES = (
+    "custom_components.anniversaries",
+    "custom_components.anniversaries.sensor",
+    "custom_components.anniversaries.calendar",
+    "custom_components.anniversaries.config_flow",
+)
+
+WATCHED = ("hdate", "dateutil", "numpy")
+
+# Total import time allowed, with room for slower CI machines
+DEFAULT_BUDGET_MS = 250
+
+_CHILD = f"""
+import json, sys
+{"; ".join(f"import {module}" for module in PREIMPORTED)}
+before = set(sys.modules)
+print("-- integration --", file=sys.stderr)
+{"; ".join(f"import {module}" for module in MODULES)}
+loaded = {{name.split(".")[0] for name in set(sys.modules) - before}}
+print(json.dumps({{name: name in loaded for name in {WATCHED!r}}}))
+"""
+
+
+def measure() -> tuple[dict[str, int], dict[str, bool]]:
+    """Return the cumulative microseconds of each top level import, and the watched packages it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    _, _, report = result.stderr.partition("-- integration --")
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented and already counted in their parent
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times, json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="fail if the total is over this, 0 to only report"
+    )
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    times, loaded = measure()
+    total_ms = sum(times.values()) / 1000
+    if args.json:
+        print(json.dumps({"total_ms": total_ms, "modules_us": times, "loaded": loaded}, indent=2))
+    else:
+        for name, cumulative in sorted(times.items(), key=lambda item: -item[1]):
+            print(f"{cumulative / 1000:8.1f} ms  {name}")
+        print(f"{total_ms:8.1f} ms  total")
+        print(", ".join(f"{name} {'loaded' if value else 'not loaded'}" for name, value in loaded.items()))
+    if args.budget_ms and total_ms > args.budget_ms:
+        print(f"Import time {total_ms:.1f} ms is over the {args.budget_ms:.1f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
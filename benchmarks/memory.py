@@ -0,0 +1,105 @@
+"""Measure the memory held per anniversary sensor.
+
+Usage:
+    python benchmarks/memory.py --sizes 1000 50000 --json
+
+Builds the synthetic population of benchmarks/suite.py on the same stub Home
+Assistant and traces allocations with tracemalloc.  For every population size
+it reports the bytes still allocated per sensor:
+
+    construct   after creating the sensor objects from their configuration
+    startup     after adding every sensor and the first batch refresh, with the
+                calendar index, coordinator and engine rows they use
+    shown       after also rendering every sensor's state and attributes once
+
+Configurations are created before tracing starts, they are shared with Home
+Assistant's config and not owned by the sensors.  Requires `homeassistant`.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import tempfile
+import tracemalloc
+from unittest.mock import patch
+
+from suite import CLOCK, START, TEMPLATE_ENTITY, population
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.anniversaries.calendar import EntitiesCalendarData
+from custom_components.anniversaries.const import CALENDAR_PLATFORM, DOMAIN
+from custom_components.anniversaries.hebrew import clear_caches
+from custom_components.anniversaries.sensor import anniversaries
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+
+
+def _traced() -> int:
+    """Return the bytes currently allocated since tracing started."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+async def _measure(config_dir: str, size: int) -> dict:
+    """Return the bytes per sensor of one population size at each stage."""
+    clear_caches()
+    hass = HomeAssistant(config_dir)
+    hass.states.async_set(TEMPLATE_ENTITY, "2001-12-25")
+    hass.data.setdefault(DOMAIN, {})[CALENDAR_PLATFORM] = EntitiesCalendarData(hass)
+    configs = population(size)
+
+    def ignore_write():
+        pass
+
+    tracemalloc.start()
+    base = _traced()
+    sensors = [anniversaries(hass, config) for config in configs]
+    for index, sensor in enumerate(sensors):
+        sensor.hass = hass
+        sensor.entity_id = f"sensor.bench_{index}"
+        sensor.async_write_ha_state = ignore_write
+    construct = _traced() - base
+
+    for sensor in sensors:
+        await sensor.async_added_to_hass()
+    await hass.async_block_till_done()
+    startup = _traced() - base
+
+    for sensor in sensors:
+        sensor.state
+        sensor.extra_state_attributes
+    shown = _traced() - base
+    tracemalloc.stop()
+
+    for sensor in sensors:
+        await sensor.async_will_remove_from_hass()
+    await hass.async_block_till_done()
+    result = {"size": size, "construct": construct / size, "startup": startup / size, "shown": shown / size}
+    print(
+        f"{size:>7} construct {result['construct']:8.0f} B  startup {result['startup']:8.0f} B  "
+        f"shown {result['shown']:8.0f} B per sensor",
+        file=sys.stderr,
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir, patch.object(dt_util, "now", CLOCK):
+        for size in args.sizes:
+            CLOCK.now = START
+            results.append(asyncio.run(_measure(config_dir, size)))
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Time the startup of a YAML configuration with many anniversaries.
+
+Usage:
+    python benchmarks/startup.py 1000 10000 50000
+
+Boots a Home Assistant core in a temporary configuration directory with this
+integration linked in as a custom component, then times `async_setup_component`
+until every sensor has been added and calculated.  Requires `homeassistant`.
+The calendar platform is not loaded because it depends on the http component.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from homeassistant import config_entries, loader
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry,
+    device_registry,
+    entity,
+    entity_registry,
+    floor_registry,
+    issue_registry,
+    label_registry,
+    translation,
+)
+from homeassistant.setup import async_setup_component
+
+INTEGRATION = Path(__file__).resolve().parent.parent / "custom_components" / "anniversaries"
+
+
+def _sensors(count):
+    """Return a mix of Gregorian, Hebrew, one-time and half anniversaries."""
+    sensors = []
+    for index in range(count):
+        if index % 10 == 0:
+            sensors.append({"name": f"h{index}", "date": f"{1 + index % 29} Nisan {5700 + index % 80}", "calendar_type": "hebrew"})
+        else:
+            sensors.append(
+                {
+                    "name": f"g{index}",
+                    "date": f"{1950 + index % 70}-{1 + index % 12:02d}-{1 + index % 28:02d}",
+                    "one_time": index % 7 == 0,
+                    "show_half_anniversary": index % 5 == 0,
+                }
+            )
+    return sensors
+
+
+async def _startup(config_dir, count):
+    """Return the seconds taken to set up `count` YAML anniversaries."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    entity.async_setup(hass)
+    loader.async_setup(hass)
+    translation.async_setup(hass)
+    for registry in (area_registry, device_registry, entity_registry, floor_registry, issue_registry, label_registry):
+        await registry.async_load(hass)
+    await hass.async_start()
+    sensors = _sensors(count)
+    start = time.perf_counter()
+    assert await async_setup_component(hass, "anniversaries", {"anniversaries": {"sensors": sensors}})
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - start
+    assert len(hass.states.async_entity_ids("sensor")) == count
+    await hass.async_stop()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("counts", type=int, nargs="*", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+    # The missing http component makes the calendar setup log errors
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.makedirs(os.path.join(config_dir, "custom_components"))
+        os.symlink(INTEGRATION, os.path.join(config_dir, "custom_components", "anniversaries"))
+        for count in args.counts:
+            elapsed = asyncio.run(_startup(config_dir, count))
+            print(f"{count} anniversaries: {elapsed:.2f} s ({elapsed / count * 1e6:.0f} us per sensor)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Offline benchmarks of the sensor, parser and calendar hot paths.
+
+Usage:
+    python benchmarks/suite.py run --sizes 100 1000 10000 50000 --output after.json
+    python benchmarks/suite.py compare before.json after.json
+
+`run` builds synthetic populations of Gregorian, Hebrew, template, one-time and
+half-anniversary sensors on a stub Home Assistant: a bare core with no
+integrations set up, where sensors are wired in directly and state writes are
+counted instead of stored.  For every population size it times:
+
+    parse_cold, parse_warm   parsing every configured date, without and with the cache
+    construct                creating the sensor objects from their configuration
+    startup                  adding every sensor (calendar, coordinator, first batch refresh)
+    update                   a single sensor's async_update (mean over a sample)
+    midnight                 the full refresh of every sensor on a new day
+    calendar_month_*         a month of calendar events, cold and warm event caches
+    calendar_year_*          a year of calendar events, cold and warm event caches
+
+Results are written as JSON.  `compare` prints the ratio of two result files
+and exits non-zero if a benchmark slowed down by more than --threshold.
+Requires `homeassistant`.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.anniversaries.calendar import EntitiesCalendarData  # noqa: E402
+from custom_components.anniversaries.const import CALENDAR_PLATFORM, DOMAIN, SENSOR_SCHEMA  # noqa: E402
+from custom_components.anniversaries.coordinator import async_get_coordinator  # noqa: E402
+from custom_components.anniversaries.dates import parse_date  # noqa: E402
+from custom_components.anniversaries.hebrew import clear_caches  # noqa: E402
+from custom_components.anniversaries.sensor import anniversaries  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+# First simulated day, every midnight refresh moves one day on
+START = datetime(2024, 3, 10, 12, 0, tzinfo=dt_util.UTC)
+# Sensors timed for the per-update latency
+UPDATE_SAMPLE = 1000
+TEMPLATE_ENTITY = "input_text.benchmark_date"
+
+
+def population(count: int) -> list[dict]:
+    """Return a reproducible mix of anniversary configurations."""
+    months = ("Tishrei", "Cheshvan", "Kislev", "Tevet", "Shevat", "Nisan", "Iyar", "Sivan", "Tammuz", "Av", "Elul")
+    configs = []
+    for index in range(count):
+        name = f"bench_{index}"
+        if index % 50 == 0:
+            configs.append({"name": name, "date_template": f"{{{{ states('{TEMPLATE_ENTITY}') }}}}"})
+        elif index % 5 == 0:
+            configs.append(
+                {
+                    "name": name,
+                    "date": f"{1 + index % 29} {months[index % len(months)]} {5700 + index % 80}",
+                    "calendar_type": "hebrew",
+                }
+            )
+        else:
+            configs.append(
+                {
+                    "name": name,
+                    "date": f"{1950 + index % 70}-{1 + index % 12:02d}-{1 + index % 28:02d}",
+                    "one_time": index % 7 == 0,
+                    "show_half_anniversary": index % 3 == 0,
+                }
+            )
+    return [SENSOR_SCHEMA(config) for config in configs]
+
+
+def _timed(function, *args) -> float:
+    """Return the seconds taken by one call."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+async def _async_timed(coroutine) -> float:
+    """Return the seconds taken to await a coroutine."""
+    start = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - start
+
+
+class Clock:
+    """Local time seen by the integration, moved on by the midnight benchmark."""
+
+    def __init__(self) -> None:
+        self.now = START
+
+    def __call__(self, time_zone=None) -> datetime:
+        return self.now
+
+
+CLOCK = Clock()
+
+
+async def _run_size(config_dir: str, size: int, repeat: int) -> list[dict]:
+    """Time every benchmark for one population size."""
+    results = []
+
+    def record(benchmark: str, samples: list[float], items: int) -> None:
+        seconds = statistics.median(samples)
+        results.append(
+            {"benchmark": benchmark, "size": size, "items": items, "seconds": seconds, "per_item_us": seconds / items * 1e6}
+        )
+        print(f"{size:>7} {benchmark:<22} {seconds * 1000:10.2f} ms {seconds / items * 1e6:10.2f} us/item", file=sys.stderr)
+
+    clear_caches()
+    configs = population(size)
+    dates = [(config["date"], config.get("calendar_type", "gregorian")) for config in configs if "date" in config]
+
+    def parse_all():
+        for value, calendar_type in dates:
+            parse_date(value, calendar_type)
+
+    cold = []
+    for _ in range(repeat):
+        parse_date.cache_clear()
+        cold.append(_timed(parse_all))
+    record("parse_cold", cold, len(dates))
+    record("parse_warm", [_timed(parse_all) for _ in range(repeat)], len(dates))
+
+    hass = HomeAssistant(config_dir)
+    hass.states.async_set(TEMPLATE_ENTITY, "2001-12-25")
+    hass.data.setdefault(DOMAIN, {})[CALENDAR_PLATFORM] = EntitiesCalendarData(hass)
+    record("construct", [_timed(lambda: [anniversaries(hass, config) for config in configs]) for _ in range(repeat)], size)
+
+    writes = [0]
+
+    def count_write():
+        writes[0] += 1
+
+    sensors = [anniversaries(hass, config) for config in configs]
+    for index, sensor in enumerate(sensors):
+        sensor.hass = hass
+        sensor.entity_id = f"sensor.bench_{index}"
+        sensor.async_write_ha_state = count_write
+
+    async def startup():
+        for sensor in sensors:
+            await sensor.async_added_to_hass()
+        await hass.async_block_till_done()
+
+    record("startup", [await _async_timed(startup())], size)
+    assert writes[0] >= size - size // 50, f"only {writes[0]} of {size} sensors were written"
+
+    sample = sensors[:: max(1, size // UPDATE_SAMPLE)]
+
+    async def update_sample():
+        for sensor in sample:
+            await sensor.async_update()
+
+    record("update", [await _async_timed(update_sample()) for _ in range(repeat)], len(sample))
+
+    coordinator = async_get_coordinator(hass)
+    midnight = []
+    for _ in range(repeat):
+        CLOCK.now += timedelta(days=1)
+        midnight.append(_timed(coordinator.async_refresh))
+    record("midnight", midnight, size)
+
+    calendar = hass.data[DOMAIN][CALENDAR_PLATFORM]
+    today = CLOCK.now
+    for window, days in (("month", 31), ("year", 365)):
+        end = today + timedelta(days=days)
+        cold = []
+        for _ in range(repeat):
+            for sensor in sensors:
+                calendar.invalidate_events(sensor.entity_id)
+            cold.append(await _async_timed(calendar.async_get_events(hass, today, end)))
+        events = len(await calendar.async_get_events(hass, today, end))
+        record(f"calendar_{window}_cold", cold, max(events, 1))
+        warm = [await _async_timed(calendar.async_get_events(hass, today, end)) for _ in range(repeat)]
+        record(f"calendar_{window}_warm", warm, max(events, 1))
+
+    for sensor in sensors:
+        await sensor.async_will_remove_from_hass()
+    await hass.async_block_till_done()
+    return results
+
+
+
+def _git_commit() -> str | None:
+    """Return the commit being benchmarked, if this is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: list[int], repeat: int, output: str | None) -> None:
+    """Run the benchmarks and write the results as JSON."""
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir, patch.object(dt_util, "now", CLOCK):
+        for size in sizes:
+            CLOCK.now = START
+            results.extend(asyncio.run(_run_size(config_dir, size, repeat)))
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+            "machine": platform.machine(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+def compare(before: str, after: str, threshold: float) -> None:
+    """Print the ratio of two result files, exiting non-zero on a slowdown over the threshold."""
+    loaded = []
+    for path in (before, after):
+        with open(path, encoding="utf-8") as file:
+            loaded.append({(row["benchmark"], row["size"]): row["seconds"] for row in json.load(file)["results"]})
+    old, new = loaded
+    slower = []
+    for key in sorted(old.keys() & new.keys(), key=lambda key: (key[1], key[0])):
+        ratio = new[key] / old[key] if old[key] else float("inf")
+        flag = " SLOWER" if ratio > threshold else ""
+        print(f"{key[1]:>7} {key[0]:<22} {old[key] * 1000:10.2f} ms -> {new[key] * 1000:10.2f} ms  x{ratio:.2f}{flag}")
+        if flag:
+            slower.append(key)
+    if slower:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark, the median is kept")
+    run_parser.add_argument("--output", help="JSON file to write, standard output if omitted")
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.sizes, args.repeat, args.output)
+    else:
+        compare(args.before, args.after, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,18 +9,39 @@ from homeassistant.const import CONF_NAME
 
 from .const import (
     CONF_SENSORS,
+    CONF_FILE,
+    CONF_FILES,
     CONF_DATE_TEMPLATE,
+    CONF_REFRESH_JITTER,
+    CONF_HEBREW_ENGINE,
+    CONF_TRACE_STARTUP,
+    CONFIG_ENTRY_SENSORS,
     DOMAIN,
+    HEBREW_ENGINE_HDATE,
     ISSUE_URL,
     PLATFORM,
     VERSION,
     CONFIG_SCHEMA,
 )
+from .coordinator import async_get_coordinator
+from .hebrew import import_hdate, set_engine
+from .services import async_register_services
+from .tracing import async_trace_startup
+from .views import async_register_views
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup(hass, config):
     """Set up this component using YAML."""
+    if config.get(DOMAIN, {}).get(CONF_TRACE_STARTUP):
+        # Before anything else, so restoring saved results is traced too
+        async_trace_startup(hass)
+
+    # Saved results let YAML and UI sensors alike show their state at once after a restart
+    await async_get_coordinator(hass).async_load_results()
+    async_register_views(hass)
+    async_register_services(hass)
+
     if config.get(DOMAIN) is None:
         # Config flow setup if no YAML config exists
         return True
@@ -30,16 +51,33 @@ async def async_setup(hass, config):
         CC_STARTUP_VERSION.format(name=DOMAIN, version=VERSION, issue_link=ISSUE_URL)
     )
 
+    # Spread the midnight refresh of YAML and UI sensors alike
+    hass.data.setdefault(DOMAIN, {})[CONF_REFRESH_JITTER] = config[DOMAIN].get(CONF_REFRESH_JITTER)
+    hebrew_engine = config[DOMAIN].get(CONF_HEBREW_ENGINE)
+    if hebrew_engine == HEBREW_ENGINE_HDATE:
+        # Keep the slow hdate import off the event loop
+        await hass.async_add_executor_job(import_hdate)
+    set_engine(hebrew_engine)
+
     platform_config = config[DOMAIN].get(CONF_SENSORS, {})
+    files = config[DOMAIN].get(CONF_FILES, [])
 
     # If no platform is enabled, skip setup
-    if not platform_config:
+    if not platform_config and not files:
         return False
 
-    # Load platform configuration for each entry
-    for entry in platform_config:
+    # Load all YAML sensors in a single platform
+    if platform_config:
+        hass.async_create_task(
+            discovery.async_load_platform(
+                hass, PLATFORM, DOMAIN, {CONF_SENSORS: platform_config}, config
+            )
+        )
+
+    # Each anniversaries file is a sensor platform of its own
+    for path in files:
         hass.async_create_task(
-            discovery.async_load_platform(hass, PLATFORM, DOMAIN, entry, config)
+            discovery.async_load_platform(hass, PLATFORM, DOMAIN, {CONF_FILE: path}, config)
         )
 
     # Initiate config flow to import YAML config
@@ -68,8 +106,8 @@ async def async_setup_entry(hass, config_entry):
         config_entry, options=config_entry.data
     )
 
-    # Add update listener for configuration changes
-    config_entry.add_update_listener(update_listener)
+    # Add update listener for configuration changes, removed again when the entry is unloaded
+    config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
 
     # Set up the platforms using the new `async_forward_entry_setups`
     await hass.config_entries.async_forward_entry_setups(config_entry, [PLATFORM])
@@ -79,7 +117,8 @@ async def async_setup_entry(hass, config_entry):
 async def async_unload_entry(hass, config_entry):
     """Unload a config entry."""
     # Unload the platform using the new `async_forward_entry_unload`
-    if await hass.config_entries.async_forward_entry_unload(config_entry, [PLATFORM]):
+    if await hass.config_entries.async_forward_entry_unload(config_entry, PLATFORM):
+        hass.data.get(DOMAIN, {}).get(CONFIG_ENTRY_SENSORS, {}).pop(config_entry.entry_id, None)
         _LOGGER.info(f"Successfully unloaded {PLATFORM} for {DOMAIN}")
         return True
     else:
@@ -102,6 +141,8 @@ async def update_listener(hass, entry):
         title=new_title
     )
 
-    # Unload and reload platform to apply new settings
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
\ No newline at end of file
+    # Apply the new settings to the live sensor, reload only if its entity ID has to change
+    sensor = hass.data.get(DOMAIN, {}).get(CONFIG_ENTRY_SENSORS, {}).get(entry.entry_id)
+    if sensor is not None and sensor.hass is not None and sensor.async_reconfigure(entry.data):
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
@@ -1,16 +1,32 @@
 """Anniversaries calendar."""
 import logging
-from datetime import datetime, timedelta
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from heapq import merge
+from itertools import takewhile
+from typing import Iterator
+import time
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.core import HomeAssistant
-from homeassistant.util import Throttle
+import homeassistant.util.dt as dt_util
 
 from .const import CALENDAR_NAME, CALENDAR_PLATFORM, DOMAIN, SENSOR_PLATFORM, CALENDAR_TYPE_HEBREW
+from .hebcal import ADAR, ADAR_II
+from .hebrew import ordinal_to_hebrew
+from .metrics import CALENDAR_EVENTS, CALENDAR_QUERY
+from .tracing import TRACER
 
 _LOGGER = logging.getLogger(__name__)
 
-MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=1)
+HALF_ANNIVERSARY_SUMMARY = "{} (half anniversary)"
+
+# Occurrences whose events are kept per entity between recomputes
+EVENT_CACHE_SIZE = 32
+
+# Keys of the day-of-year index are month * 32 + day, Hebrew days come after every Gregorian day
+HEBREW_DAY_KEYS = 1024
+LAST_DAY_KEY = 2047
 
 
 async def async_setup_platform(
@@ -20,7 +36,8 @@ async def async_setup_platform(
     # pylint: disable=unused-argument
     # Only single instance allowed
     if not AnniversariesCalendar.instances:
-        async_add_entities([AnniversariesCalendar()], True)
+        with TRACER.span("calendar_platform", "setup"):
+            async_add_entities([AnniversariesCalendar()], True)
 
 
 class AnniversariesCalendar(CalendarEntity):
@@ -44,10 +61,6 @@ class AnniversariesCalendar(CalendarEntity):
         """Return the name of the entity."""
         return self._attr_name
 
-    async def async_update(self) -> None:
-        """Update all calendars."""
-        await self.hass.data[DOMAIN][CALENDAR_PLATFORM].async_update()
-
     async def async_get_events(
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> list[CalendarEvent]:
@@ -68,23 +81,200 @@ class AnniversariesCalendar(CalendarEntity):
 class EntitiesCalendarData:
     """Class used by the Entities Calendar class to hold all entity events."""
 
-    __slots__ = "_hass", "event", "entities", "_throttle"
+    __slots__ = (
+        "_hass",
+        "entities",
+        "_index",
+        "_indexed",
+        "_days",
+        "_day_entries",
+        "_unkeyed",
+        "_events",
+        "revision",
+        "_revised_at",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize an Entities Calendar Data."""
         self._hass = hass
-        self.event: CalendarEvent | None = None
-        self.entities: list[str] = []
+        self.entities: dict[str, None] = {}
+        # Upcoming (next date ordinal, entity ID) pairs kept sorted, the first is the next event
+        self._index: list[tuple[int, str]] = []
+        self._indexed: dict[str, int] = {}
+        # (day-of-year key, entity ID, half anniversary) of every event kept sorted, built by the first query
+        self._days: list[tuple[int, str, bool]] | None = None
+        self._day_entries: dict[str, tuple[tuple[int, str, bool], ...]] = {}
+        # Entities whose days must be looked up again before the next query
+        self._unkeyed: set[str] = set()
+        # Events built for each entity, keyed on (start, half anniversary)
+        self._events: dict[str, dict[tuple[date, bool], CalendarEvent]] = {}
+        # Bumped whenever an entity's events may have changed, identifies a version of the ICS feed
+        self.revision = 0
+        self._revised_at: datetime | None = None
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the nearest upcoming anniversary."""
+        if not self._index:
+            return None
+        _, ent = self._index[0]
+        entity = self._hass.data[DOMAIN].get(SENSOR_PLATFORM, {}).get(ent)
+        if not entity or not entity.name or entity.next_date is None:
+            return None
+        return self._event(entity, entity.next_date)
+
+    @property
+    def revised_at(self) -> datetime:
+        """Return when the current revision was first seen."""
+        if self._revised_at is None:
+            self._revised_at = dt_util.utcnow()
+        return self._revised_at
+
+    def _revise(self) -> None:
+        """Start a new revision of the events."""
+        self.revision += 1
+        self._revised_at = None
+
+    @property
+    def upcoming_count(self) -> int:
+        """Return the number of entities with an upcoming anniversary."""
+        return len(self._index)
+
+    def upcoming(self, first: date, last: date | None = None) -> Iterator[tuple[date, object]]:
+        """Yield (next date, entity) from the index, in date order, for next dates from `first` to `last`."""
+        sensors = self._hass.data[DOMAIN].get(SENSOR_PLATFORM, {})
+        last_ordinal = last.toordinal() if last is not None else None
+        index = self._index
+        for position in range(bisect_left(index, (first.toordinal(), "")), len(index)):
+            ordinal, entity_id = index[position]
+            if last_ordinal is not None and ordinal > last_ordinal:
+                return
+            entity = sensors.get(entity_id)
+            if entity is not None:
+                yield date.fromordinal(ordinal), entity
 
     def add_entity(self, entity_id: str) -> None:
         """Append entity ID to the calendar."""
-        if entity_id not in self.entities:
-            self.entities.append(entity_id)
+        self.entities[entity_id] = None
+        if self._days is not None:
+            self._unkeyed.add(entity_id)
+        self._revise()
 
     def remove_entity(self, entity_id: str) -> None:
         """Remove entity ID from the calendar."""
-        if entity_id in self.entities:
-            self.entities.remove(entity_id)
+        self.entities.pop(entity_id, None)
+        self.update_entity(entity_id, None)
+        self.invalidate_events(entity_id)
+
+    def update_entity(self, entity_id: str, next_date: date | None) -> None:
+        """Move an entity to its new next date in the index, or drop it when it has none."""
+        ordinal = next_date.toordinal() if next_date is not None else None
+        previous = self._indexed.get(entity_id)
+        if previous == ordinal:
+            return
+        if previous is not None:
+            del self._index[bisect_left(self._index, (previous, entity_id))]
+            del self._indexed[entity_id]
+        if ordinal is not None:
+            insort(self._index, (ordinal, entity_id))
+            self._indexed[entity_id] = ordinal
+        self._revise()
+
+    def invalidate_events(self, entity_id: str) -> None:
+        """Forget the events built for an entity, after it has recomputed."""
+        self._events.pop(entity_id, None)
+        if self._days is not None:
+            self._unkeyed.add(entity_id)
+        self._revise()
+
+    def _update_days(self, sensors: dict) -> None:
+        """Bring the day-of-year index up to date with the entities added or recomputed since the last query."""
+        days = self._days
+        if days is None or len(self._unkeyed) * 8 > len(days):
+            entries = ((ent, _entity_days(sensors.get(ent))) for ent in self.entities)
+            self._day_entries = {ent: days for ent, days in entries if days}
+            self._days = sorted(entry for entries in self._day_entries.values() for entry in entries)
+        else:
+            for ent in self._unkeyed:
+                previous = self._day_entries.pop(ent, ())
+                entries = _entity_days(sensors.get(ent)) if ent in self.entities else ()
+                if entries != previous:
+                    for entry in previous:
+                        del days[bisect_left(days, entry)]
+                    for entry in entries:
+                        insort(days, entry)
+                if entries:
+                    self._day_entries[ent] = entries
+        self._unkeyed.clear()
+
+    def _window_entities(self, sensors: dict, start: date, end: date) -> Iterator[tuple[str, bool]]:
+        """Yield the (entity ID, half anniversary) whose events can fall from start to end."""
+        if (end - start).days >= 365:
+            for ent in self.entities:
+                yield ent, False
+                yield ent, True
+            return
+        self._update_days(sensors)
+        days = self._days
+        first, last = _day_key(start.month, start.day), _day_key(end.month, end.day)
+        ranges = _key_ranges(first, last, 0, HEBREW_DAY_KEYS - 1)
+        first, last = ordinal_to_hebrew(start.toordinal()), ordinal_to_hebrew(end.toordinal())
+        # Adar anniversaries move between Adar, Adar I and Adar II with leap years
+        first_key = _day_key(ADAR, 0, True) if ADAR <= first.month <= ADAR_II else _day_key(first.month, first.day, True)
+        if ADAR <= last.month <= ADAR_II:
+            last_key = _day_key(ADAR_II, 31, True)
+        else:
+            # The 30th of a month that has 29 days this year falls on the 29th
+            last_key = _day_key(last.month, last.day + (last.day == 29), True)
+        if last.year - first.year > 1 or (last.year > first.year and first_key <= last_key):
+            ranges.append((HEBREW_DAY_KEYS, LAST_DAY_KEY))
+        else:
+            ranges.extend(_key_ranges(first_key, last_key, HEBREW_DAY_KEYS, LAST_DAY_KEY))
+        # Leap days are also kept on 28 February, so an event can be found twice
+        found = set()
+        for low, high in ranges:
+            for position in range(bisect_left(days, (low,)), bisect_left(days, (high + 1,))):
+                _, ent, half = days[position]
+                if (ent, half) not in found:
+                    found.add((ent, half))
+                    yield ent, half
+
+    def _event(self, entity, start: date, half: bool = False) -> CalendarEvent:
+        """Return the cached event of one occurrence, building it on first use."""
+        events = self._events.setdefault(entity.entity_id, {})
+        event = events.get((start, half))
+        if event is None:
+            CALENDAR_EVENTS.inc("miss")
+            if len(events) >= EVENT_CACHE_SIZE:
+                events.clear()
+            event = events[(start, half)] = self._build_event(entity, start, half)
+        return event
+
+    def _build_event(self, entity, start: date, half: bool = False) -> CalendarEvent:
+        """Create the calendar event for one occurrence of an entity's anniversary."""
+        description = ""
+
+        # Add Hebrew calendar information if using Hebrew calendar
+        if entity.calendar_type == CALENDAR_TYPE_HEBREW:
+            hebrew_info = []
+            if entity.hebrew_date:
+                hebrew_info.append(f"Hebrew Date: {entity.hebrew_date}")
+            if not half:
+                next_hebrew_date = entity.hebrew_date_on(start)
+                if next_hebrew_date:
+                    hebrew_info.append(f"Next Hebrew Date: {next_hebrew_date}")
+            if hebrew_info:
+                if description:
+                    description += "\n" + "\n".join(hebrew_info)
+                else:
+                    description = "\n".join(hebrew_info)
+
+        return CalendarEvent(
+            summary=HALF_ANNIVERSARY_SUMMARY.format(entity.name) if half else entity.name,
+            start=start,
+            end=start + timedelta(days=1),
+            description=description if description else None,
+        )
 
     async def async_get_events(
         self, hass: HomeAssistant, start_datetime: datetime, end_datetime: datetime
@@ -94,76 +284,52 @@ class EntitiesCalendarData:
         _LOGGER.debug("Anniversaries Calendar - Get Events")
         if SENSOR_PLATFORM not in hass.data[DOMAIN]:
             return events
+        sensors = hass.data[DOMAIN][SENSOR_PLATFORM]
+        query_start = time.perf_counter()
+        misses = CALENDAR_EVENTS.values.get("miss", 0)
         start_date = start_datetime.date()
         end_date = end_datetime.date()
-        for ent in self.entities:
-            _LOGGER.debug("Get Events: Entity Name: " + str(ent))
-            if (ent not in hass.data[DOMAIN][SENSOR_PLATFORM]):
-                continue
-            entity = self._hass.data[DOMAIN][SENSOR_PLATFORM][ent]
-            if (
-                entity
-                and entity.name
-                and entity._date != "Invalid Date"
-                and entity._next_date.date()
-                and start_date <= entity._next_date.date() <= end_date
-            ):
-                # Build description with Hebrew date info if applicable
-                description = ""
-                if "description" in entity.extra_state_attributes:
-                    description = entity.extra_state_attributes["description"]
-                
-                # Add Hebrew calendar information if using Hebrew calendar
-                if hasattr(entity, '_calendar_type') and entity._calendar_type == CALENDAR_TYPE_HEBREW:
-                    hebrew_info = []
-                    if hasattr(entity, '_hebrew_date') and entity._hebrew_date:
-                        hebrew_info.append(f"Hebrew Date: {entity._hebrew_date}")
-                    if hasattr(entity, '_next_hebrew_date') and entity._next_hebrew_date:
-                        hebrew_info.append(f"Next Hebrew Date: {entity._next_hebrew_date}")
-                    if hebrew_info:
-                        if description:
-                            description += "\n" + "\n".join(hebrew_info)
-                        else:
-                            description = "\n".join(hebrew_info)
-                
-                event = CalendarEvent(
-                    summary=entity.name,
-                    start=entity._next_date.date(),
-                    end=entity._next_date.date() + timedelta(days=1),
-                    description=description if description else None,
-                )
-                events.append(event)
+        # Every recurrence in the window, merged lazily in date order
+        streams = []
+        for ent, half in self._window_entities(sensors, start_date, end_date):
+            entity = sensors.get(ent)
+            if entity and entity.name and entity.valid:
+                occurrences = entity.half_occurrences if half else entity.occurrences
+                streams.append(_tag(occurrences(start_date), ent, half))
+        for start, ent, half in takewhile(lambda occurrence: occurrence[0] <= end_date, merge(*streams)):
+            events.append(self._event(sensors[ent], start, half))
+        # Events not built by this query came from the event cache
+        CALENDAR_EVENTS.inc("hit", len(events) - CALENDAR_EVENTS.values.get("miss", 0) + misses)
+        CALENDAR_QUERY.observe(time.perf_counter() - query_start)
         return events
 
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    async def async_update(self) -> None:
-        """Get the latest data."""
-        _LOGGER.debug("Update anniversary calendar")
-        for ent in self.entities:
-            _LOGGER.debug("Update Entity Name: " + str(ent))
-            entity = self._hass.data[DOMAIN][SENSOR_PLATFORM][ent]
-            if entity and entity.name and entity._date and entity._date != "Invalid Date":
-                # Build description with Hebrew date info if applicable
-                description = ""
-                if "description" in entity.extra_state_attributes:
-                    description = entity.extra_state_attributes["description"]
-                
-                # Add Hebrew calendar information if using Hebrew calendar
-                if hasattr(entity, '_calendar_type') and entity._calendar_type == CALENDAR_TYPE_HEBREW:
-                    hebrew_info = []
-                    if hasattr(entity, '_hebrew_date') and entity._hebrew_date:
-                        hebrew_info.append(f"Hebrew Date: {entity._hebrew_date}")
-                    if hasattr(entity, '_next_hebrew_date') and entity._next_hebrew_date:
-                        hebrew_info.append(f"Next Hebrew Date: {entity._next_hebrew_date}")
-                    if hebrew_info:
-                        if description:
-                            description += "\n" + "\n".join(hebrew_info)
-                        else:
-                            description = "\n".join(hebrew_info)
-                
-                self.event = CalendarEvent(
-                    summary=entity.name,
-                    start=entity._next_date.date(),
-                    end=entity._next_date.date() + timedelta(days=1),
-                    description=description if description else None,
-                )
+
+def _day_key(month: int, day: int, hebrew: bool = False) -> int:
+    """Return the key of a day of the year in the day-of-year index."""
+    return (HEBREW_DAY_KEYS if hebrew else 0) + month * 32 + day
+
+
+def _key_ranges(first: int, last: int, low: int, high: int) -> list[tuple[int, int]]:
+    """Return the key ranges from first to last, wrapping around the end of the year."""
+    if first <= last:
+        return [(first, last)]
+    return [(first, high), (low, last)]
+
+
+def _entity_days(entity) -> tuple[tuple[int, str, bool], ...]:
+    """Return the day-of-year index entries of an entity's events."""
+    if entity is None:
+        return ()
+    entries = set()
+    for hebrew, month, day, half in entity.calendar_days():
+        entries.add((_day_key(month, day, hebrew), entity.entity_id, half))
+        if not hebrew and (month, day) == (2, 29):
+            # Celebrated on 28 February in common years
+            entries.add((_day_key(2, 28), entity.entity_id, half))
+    return tuple(sorted(entries))
+
+
+def _tag(occurrences, entity_id: str, half: bool):
+    """Label the occurrences of one entity so they can be merged with the others."""
+    for occurrence in occurrences:
+        yield occurrence, entity_id, half
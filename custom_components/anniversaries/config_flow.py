@@ -8,7 +8,6 @@ from homeassistant.helpers.selector import (
     SelectSelectorConfig,
     SelectSelectorMode,
 )
-from datetime import datetime
 import uuid
 
 from .const import (
@@ -46,6 +45,8 @@ from .const import (
 
 from homeassistant.const import CONF_NAME
 
+from .dates import parse_date
+
 
 @config_entries.HANDLERS.register(DOMAIN)
 class AnniversariesFlowHandler(config_entries.ConfigFlow):
@@ -173,104 +174,11 @@ class AnniversariesFlowHandler(config_entries.ConfigFlow):
 
 def is_not_date(date, one_time, calendar_type=CALENDAR_TYPE_GREGORIAN):
     """Validate date based on calendar type."""
-    if calendar_type == CALENDAR_TYPE_HEBREW:
-        # Hebrew date validation
-        try:
-            from hdate import HebrewDate
-        except ImportError:
-            return True  # Can't validate Hebrew dates without hdate library
-        
-        if not date or not isinstance(date, str):
-            return True
-        
-        try:
-            # Try format: DD-MM-YYYY
-            parts = date.split("-")
-            if len(parts) == 3:
-                day = int(parts[0])
-                month = int(parts[1])
-                year = int(parts[2])
-                # Validate using HebrewDate
-                HebrewDate(year=year, month=month, day=day)
-                return False
-            # Try format: DD-MM (no year for recurring dates)
-            elif len(parts) == 2:
-                day = int(parts[0])
-                month = int(parts[1])
-                # Basic validation: Hebrew months 1-14, days 1-30
-                if 1 <= month <= 14 and 1 <= day <= 30:
-                    # For more thorough validation, try creating a date with a sample year
-                    # Use a leap year to allow all month values
-                    try:
-                        HebrewDate(year=5784, month=month, day=day)
-                        return False
-                    except (ValueError, AttributeError):
-                        return True
-                return True
-        except (ValueError, AttributeError, TypeError):
-            pass
-        
-        # Try format with month names (e.g., "5 Tishrei" or "5 Tishrei 5784")
-        try:
-            parts = date.split()
-            if len(parts) >= 2:
-                day = int(parts[0])
-                month_name = parts[1]
-                year = None
-                
-                # Handle "Adar I" and "Adar II" with space (e.g., "15 Adar I 5765" or "15 Adar II")
-                if len(parts) >= 3 and parts[1].lower() == 'adar' and parts[2].lower() in ('i', 'ii', '1', '2'):
-                    month_name = parts[1] + ' ' + parts[2]  # Combine "Adar" + "I" or "II"
-                    if len(parts) == 4:
-                        year = int(parts[3])
-                elif len(parts) == 3:
-                    year = int(parts[2])
-                
-                # Map Hebrew month names to numbers
-                # Using hdate library month numbering: Tishrei=1, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14
-                month_map = {
-                    'tishrei': 1, 'cheshvan': 2, 'marcheshvan': 2, 'kislev': 3, 'tevet': 4,
-                    'shevat': 5, 'shvat': 5, 'adar': 6,
-                    'adar1': 7, 'adar_i': 7, 'adar i': 7,
-                    'adar2': 8, 'adar_ii': 8, 'adar ii': 8,
-                    'nisan': 9, 'iyar': 10, 'sivan': 11, 'tammuz': 12,
-                    'av': 13, 'elul': 14
-                }
-                
-                month_name_lower = month_name.lower()
-                if month_name_lower in month_map:
-                    month = month_map[month_name_lower]
-                    
-                    if year is not None:
-                        # With year
-                        HebrewDate(year=year, month=month, day=day)
-                        return False
-                    else:
-                        # Without year - validate with sample leap year
-                        try:
-                            HebrewDate(year=5784, month=month, day=day)
-                            return False
-                        except (ValueError, AttributeError):
-                            return True
-        except (ValueError, AttributeError, TypeError, IndexError):
-            pass
-        
-        return True  # Invalid Hebrew date
-    else:
-        # Gregorian validation (original logic)
-        try:
-            datetime.strptime(date, "%Y-%m-%d")
-            return False
-        except ValueError:
-            if not one_time:
-                pass
-            else:
-                return True
-        try:
-            datetime.strptime(date, "%m-%d")
-            return False
-        except ValueError:
-            return True
+    spec = parse_date(date, calendar_type)
+    if spec is None:
+        return True
+    # A one-time Gregorian event needs a year
+    return bool(one_time) and spec.unknown_year and calendar_type != CALENDAR_TYPE_HEBREW
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
@@ -1,7 +1,6 @@
 """ Constants """
 from typing import Optional
 import voluptuous as vol
-from datetime import datetime
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import CONF_NAME
 
@@ -17,6 +16,15 @@ ATTRIBUTION = "Sensor data calculated by Anniversaries Integration"
 CALENDAR_NAME = "Anniversaries"
 SENSOR_PLATFORM = "sensor"
 CALENDAR_PLATFORM = "calendar"
+DAY_CONTEXT = "day_context"
+ENGINE = "engine"
+COORDINATOR = "coordinator"
+CONFIG_ENTRY_SENSORS = "config_entry_sensors"
+
+# Services
+SERVICE_UPCOMING = "upcoming"
+DEFAULT_UPCOMING_COUNT = 10
+MAX_UPCOMING_COUNT = 1000
 
 ATTR_YEARS_NEXT = "years_at_next_anniversary"
 ATTR_YEARS_CURRENT = "current_years"
@@ -30,6 +38,8 @@ CONF_SENSOR = "sensor"
 CONF_ENABLED = "enabled"
 CONF_DATE = "date"
 CONF_DATE_TEMPLATE = "date_template"
+# Parsed `date`, added by the sensor schema
+CONF_DATE_SPEC = "date_spec"
 CONF_ICON_NORMAL = "icon_normal"
 CONF_ICON_TODAY = "icon_today"
 CONF_ICON_SOON = "icon_soon"
@@ -43,6 +53,11 @@ CONF_ONE_TIME = "one_time"
 CONF_COUNT_UP = "count_up"
 CONF_CALENDAR_TYPE = "calendar_type"
 CONF_EVENT_TYPE = "event_type"
+CONF_REFRESH_JITTER = "refresh_jitter"
+CONF_HEBREW_ENGINE = "hebrew_engine"
+CONF_TRACE_STARTUP = "trace_startup"
+CONF_FILES = "files"
+CONF_FILE = "file"
 CONF_DATE_EXCLUSION_ERROR = "Configuration cannot include both `date` and `date_template`. configure ONLY ONE"
 CONF_DATE_REQD_ERROR = "Either `date` or `date_template` is Required"
 
@@ -50,6 +65,10 @@ CONF_DATE_REQD_ERROR = "Either `date` or `date_template` is Required"
 CALENDAR_TYPE_GREGORIAN = "gregorian"
 CALENDAR_TYPE_HEBREW = "hebrew"
 
+# Hebrew calendar engines
+HEBREW_ENGINE_NATIVE = "native"
+HEBREW_ENGINE_HDATE = "hdate"
+
 # Event Types
 EVENT_TYPE_BIRTHDAY = "birthday"
 EVENT_TYPE_ANNIVERSARY = "anniversary"
@@ -108,111 +127,22 @@ DEFAULT_ONE_TIME = False
 DEFAULT_COUNT_UP = False
 DEFAULT_CALENDAR_TYPE = CALENDAR_TYPE_GREGORIAN
 DEFAULT_EVENT_TYPE = EVENT_TYPE_BIRTHDAY
+DEFAULT_REFRESH_JITTER = 0
+DEFAULT_HEBREW_ENGINE = HEBREW_ENGINE_NATIVE
 
 ICON = DEFAULT_ICON_NORMAL
 
-def check_date(value):
-    try:
-        datetime.strptime(value, "%Y-%m-%d")
+def DATE_SCHEMA(value):
+    """Require either `date` or `date_template`, and parse the date once for the sensor."""
+    if CONF_DATE not in value and CONF_DATE_TEMPLATE not in value:
+        raise vol.Invalid(CONF_DATE_REQD_ERROR)
+    if CONF_DATE not in value:
         return value
-    except ValueError:
-        pass
-    try:
-        datetime.strptime(value, "%m-%d")
-        return value
-    except ValueError:
-        raise vol.Invalid(f"Invalid date: {value}")
-
-def validate_hebrew_date(value):
-    """Validate Hebrew date format and return it if valid."""
-    try:
-        from hdate import HebrewDate
-    except ImportError:
-        raise vol.Invalid("hdate library not available for Hebrew calendar support")
-    
-    # Try format: DD-MM-YYYY (Hebrew date)
-    try:
-        parts = value.split("-")
-        if len(parts) == 3:
-            day = int(parts[0])
-            month = int(parts[1])
-            year = int(parts[2])
-            # Validate by creating HebrewDate object
-            HebrewDate(year=year, month=month, day=day)
-            return value
-    except (ValueError, AttributeError):
-        pass
-    
-    # Try format: DD-MM (Hebrew date without year)
-    try:
-        parts = value.split("-")
-        if len(parts) == 2:
-            day = int(parts[0])
-            month = int(parts[1])
-            # Validate month is in valid range (1-14 for hdate library)
-            if 1 <= month <= 14 and 1 <= day <= 30:
-                return value
-    except (ValueError, AttributeError):
-        pass
-    
-    # Try format: "DD MonthName YYYY" or "DD MonthName" (e.g., "15 Adar 5745")
-    try:
-        parts = value.split()
-        if len(parts) >= 2:
-            day = int(parts[0])
-            month_name = parts[1]
-            year = None
-            
-            # Handle "Adar I" and "Adar II" with space (e.g., "15 Adar I 5765" or "15 Adar II")
-            if len(parts) >= 3 and parts[1].lower() == 'adar' and parts[2].lower() in ('i', 'ii', '1', '2', 'א', 'ב'):
-                month_name = parts[1] + ' ' + parts[2]  # Combine "Adar" + "I" or "II"
-                if len(parts) == 4:
-                    year = int(parts[3])
-            elif len(parts) == 3:
-                year = int(parts[2])
-            
-            # Map month names to numbers (case-insensitive, supporting both Hebrew and English transliterations)
-            # Using hdate library month numbering: Tishrei=1, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14
-            month_map = {
-                "tishrei": 1, "תשרי": 1,
-                "cheshvan": 2, "marcheshvan": 2, "חשוון": 2, "מרחשוון": 2,
-                "kislev": 3, "כסלו": 3,
-                "tevet": 4, "טבת": 4,
-                "shevat": 5, "shvat": 5, "שבט": 5,
-                "adar": 6, "אדר": 6,
-                "adar1": 7, "adar_i": 7, "adar i": 7, "אדר א": 7,
-                "adar2": 8, "adar_ii": 8, "adar ii": 8, "אדר ב": 8,
-                "nisan": 9, "ניסן": 9,
-                "iyar": 10, "אייר": 10,
-                "sivan": 11, "סיוון": 11,
-                "tammuz": 12, "תמוז": 12,
-                "av": 13, "אב": 13,
-                "elul": 14, "אלול": 14,
-            }
-            
-            # Convert month name to lowercase for case-insensitive matching
-            month_name_lower = month_name.lower()
-            month_num = month_map.get(month_name_lower)
-            if month_num and year:
-                # Validate by creating HebrewDate object
-                HebrewDate(year=year, month=month_num, day=day)
-                return value
-            elif month_num and not year:
-                # Valid month and day without year
-                if 1 <= day <= 30:
-                    return value
-    except (ValueError, KeyError, AttributeError):
-        pass
-    
-    raise vol.Invalid(f"Invalid Hebrew date: {value}. Use format DD-MM-YYYY, DD-MM, or 'DD MonthName YYYY'")
-
-DATE_SCHEMA = vol.Schema(
-    {
-        vol.Required(
-            vol.Any(CONF_DATE,CONF_DATE_TEMPLATE,msg=CONF_DATE_REQD_ERROR)
-        ): object
-    }, extra=vol.ALLOW_EXTRA
-)
+    # dates imports this module
+    from .dates import parse_date
+
+    # An invalid date is kept as None, the sensor then reports it as its state
+    return {**value, CONF_DATE_SPEC: parse_date(value[CONF_DATE], value[CONF_CALENDAR_TYPE])}
 
 SENSOR_CONFIG_SCHEMA = vol.All(
     # Deprecated - will be removed in future version
@@ -243,7 +173,15 @@ SENSOR_SCHEMA = vol.All(SENSOR_CONFIG_SCHEMA, DATE_SCHEMA)
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
-            {vol.Optional(CONF_SENSORS): vol.All(cv.ensure_list, [SENSOR_SCHEMA])}
+            {
+                vol.Optional(CONF_SENSORS): vol.All(cv.ensure_list, [SENSOR_SCHEMA]),
+                vol.Optional(CONF_FILES): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional(CONF_REFRESH_JITTER, default=DEFAULT_REFRESH_JITTER): cv.positive_int,
+                vol.Optional(CONF_HEBREW_ENGINE, default=DEFAULT_HEBREW_ENGINE): vol.In(
+                    [HEBREW_ENGINE_NATIVE, HEBREW_ENGINE_HDATE]
+                ),
+                vol.Optional(CONF_TRACE_STARTUP, default=False): cv.boolean,
+            }
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -0,0 +1,173 @@
+"""Refresh cycle shared by all Anniversaries sensors."""
+from datetime import datetime, timedelta
+import logging
+import random
+import time
+
+from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.start import async_at_started
+import homeassistant.util.dt as dt_util
+
+from .const import CONF_REFRESH_JITTER, COORDINATOR, DEFAULT_REFRESH_JITTER, DOMAIN
+from .day_context import async_get_day_context
+from .engine import async_get_engine
+from .metrics import REFRESH
+from .store import ResultStore
+from .tracing import TRACER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AnniversariesCoordinator:
+    """Recalculate every anniversary sensor in one pass, at startup and at local midnight.
+
+    Results are saved, on a restart the same day sensors show them at once and are
+    only recalculated after Home Assistant has started.
+    """
+
+    __slots__ = (
+        "_hass",
+        "_entities",
+        "_pending",
+        "_unsub_midnight",
+        "_refresh_offset",
+        "_results",
+        "_restored",
+        "last_refresh",
+        "last_refresh_duration",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coordinator."""
+        self._hass = hass
+        self._entities: dict = {}
+        self._pending: list = []
+        self._unsub_midnight = None
+        # Drawn when the first refresh is scheduled, once the YAML configuration is known
+        self._refresh_offset: float | None = None
+        self._results = ResultStore(hass, self._entities)
+        # Sensors showing saved results until Home Assistant has started, None once it has
+        self._restored: list | None = None
+        self.last_refresh: datetime | None = None
+        self.last_refresh_duration: float | None = None
+
+    @property
+    def entity_count(self) -> int:
+        """Return the number of sensors driven by the coordinator."""
+        return len(self._entities)
+
+    async def async_load_results(self) -> None:
+        """Load the results saved by the previous run, they are shown until Home Assistant has started."""
+        if self._hass.state is CoreState.running or not await self._results.async_load():
+            return
+        self._restored = []
+        async_at_started(self._hass, self._async_started)
+
+    @callback
+    def _async_started(self, hass: HomeAssistant) -> None:
+        """Calculate the sensors that were restored during startup."""
+        restored, self._restored = self._restored, None
+        self._async_refresh([entity for entity in restored if entity.entity_id in self._entities])
+
+    @callback
+    def async_add_entity(self, entity) -> None:
+        """Start driving a sensor, its first calculation is batched with the other new sensors."""
+        self._entities[entity.entity_id] = entity
+        self._pending.append(entity)
+        if len(self._pending) == 1:
+            self._hass.loop.call_soon(self._async_refresh_pending)
+        if self._unsub_midnight is None:
+            self._schedule_midnight_refresh()
+
+    @callback
+    def async_remove_entity(self, entity) -> None:
+        """Stop driving a sensor."""
+        self._entities.pop(entity.entity_id, None)
+        if not self._entities and self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+
+    def _schedule_midnight_refresh(self) -> None:
+        """Schedule the next refresh at local midnight (plus the jitter)."""
+        if self._refresh_offset is None:
+            jitter = self._hass.data.get(DOMAIN, {}).get(CONF_REFRESH_JITTER) or DEFAULT_REFRESH_JITTER
+            self._refresh_offset = random.uniform(0, jitter)
+        next_midnight = dt_util.start_of_local_day(dt_util.now().date() + timedelta(days=1))
+        self._unsub_midnight = async_track_point_in_time(
+            self._hass,
+            self._async_midnight_refresh,
+            next_midnight + timedelta(seconds=self._refresh_offset),
+        )
+
+    @callback
+    def _async_midnight_refresh(self, now: datetime) -> None:
+        """Recalculate all sensors once the local day has changed."""
+        self._schedule_midnight_refresh()
+        self._async_refresh(list(self._entities.values()))
+
+    @callback
+    def _async_refresh_pending(self) -> None:
+        """Calculate the sensors added since the last pass."""
+        pending, self._pending = self._pending, []
+        entities = [entity for entity in pending if entity.entity_id in self._entities]
+        if self._restored is not None:
+            with TRACER.span("restore", "refresh", {"sensors": len(entities)}):
+                entities = [entity for entity in entities if not self._async_restore(entity)]
+        if entities:
+            self._async_refresh(entities)
+
+    @callback
+    def _async_restore(self, entity) -> bool:
+        """Show a sensor's saved result if it was computed today with the same configuration."""
+        today = async_get_day_context(self._hass).date
+        result = self._results.pop(entity.entity_id, entity.config_key, today)
+        if result is None or not entity.restore(result, today):
+            return False
+        entity.async_write_ha_state()
+        self._restored.append(entity)
+        return True
+
+    @callback
+    def async_refresh_entity(self, entity) -> None:
+        """Recalculate one sensor now, if the coordinator already drives it."""
+        if entity.entity_id in self._entities:
+            self._async_refresh([entity])
+
+    @callback
+    def async_refresh(self) -> None:
+        """Recalculate all sensors now."""
+        self._async_refresh(list(self._entities.values()))
+
+    @callback
+    def _async_refresh(self, entities: list) -> None:
+        """Calculate the sensors in one batch and write the states that changed."""
+        start = time.perf_counter()
+        with TRACER.span("prepare", "refresh", {"sensors": len(entities)}):
+            for entity in entities:
+                entity.prepare()
+        with TRACER.span("compute", "refresh"):
+            async_get_engine(self._hass).compute(async_get_day_context(self._hass).date)
+        changed = 0
+        with TRACER.span("calculate", "refresh"):
+            for entity in entities:
+                if entity.calculate():
+                    entity.async_write_ha_state()
+                    changed += 1
+        self.last_refresh = dt_util.utcnow()
+        self.last_refresh_duration = time.perf_counter() - start
+        REFRESH.observe(self.last_refresh_duration)
+        self._results.async_schedule_save()
+        _LOGGER.debug(
+            f"Refreshed {len(entities)} anniversaries ({changed} changed) in {self.last_refresh_duration * 1000:.1f} ms"
+        )
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant) -> AnniversariesCoordinator:
+    """Return the coordinator shared by all anniversary sensors."""
+    data = hass.data.setdefault(DOMAIN, {})
+    coordinator = data.get(COORDINATOR)
+    if coordinator is None:
+        coordinator = data[COORDINATOR] = AnniversariesCoordinator(hass)
+    return coordinator
@@ -0,0 +1,119 @@
+"""Parsing of configured anniversary dates, shared by the schema, config flow and sensors."""
+from datetime import date
+from functools import lru_cache
+import re
+import time
+from typing import NamedTuple
+
+from . import hebcal
+from .const import CALENDAR_TYPE_HEBREW
+from .metrics import DATE_PARSE, register_cache
+
+# Number of date strings kept in the parse cache
+PARSE_CACHE_SIZE = 4096
+
+# Year used to check dates without a year, as strptime does for "%m-%d"
+GREGORIAN_REFERENCE_YEAR = 1900
+# Leap year used to check Hebrew dates without a year, so Adar I and Adar II exist
+HEBREW_REFERENCE_YEAR = 5784
+
+# Month numbering of the hdate library: Tishrei=1, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14
+HEBREW_MONTH_NAMES = (
+    "", "Tishrei", "Cheshvan", "Kislev", "Tevet", "Shevat", "Adar",
+    "Adar I", "Adar II",
+    "Nisan", "Iyar", "Sivan", "Tammuz", "Av", "Elul",
+)
+
+# Accepted spellings of each month (lower case, single spaces), English transliterations and Hebrew
+HEBREW_MONTHS = {
+    "tishrei": 1, "תשרי": 1,
+    "cheshvan": 2, "marcheshvan": 2, "חשוון": 2, "מרחשוון": 2,
+    "kislev": 3, "כסלו": 3,
+    "tevet": 4, "טבת": 4,
+    "shevat": 5, "shvat": 5, "שבט": 5,
+    "adar": 6, "אדר": 6,
+    "adar1": 7, "adar_i": 7, "adar i": 7, "אדר א": 7,
+    "adar2": 8, "adar_ii": 8, "adar ii": 8, "אדר ב": 8,
+    "nisan": 9, "ניסן": 9,
+    "iyar": 10, "אייר": 10,
+    "sivan": 11, "סיוון": 11,
+    "tammuz": 12, "תמוז": 12,
+    "av": 13, "אב": 13,
+    "elul": 14, "אלול": 14,
+}
+
+# YYYY-MM-DD or MM-DD
+_GREGORIAN = re.compile(r"(?:(\d{4})-)?(\d{1,2})-(\d{1,2})")
+# DD-MM-YYYY or DD-MM
+_HEBREW_NUMERIC = re.compile(r"(\d{1,2})\s*-\s*(\d{1,2})(?:\s*-\s*([1-9]\d{0,3}))?")
+# DD MonthName YYYY or DD MonthName, the month name may be two words ("Adar II")
+_HEBREW_NAMED = re.compile(r"(\d{1,2})\s+(\S+(?:\s+\S+)??)(?:\s+([1-9]\d{0,3}))?")
+_SPACES = re.compile(r"\s+")
+
+
+class DateSpec(NamedTuple):
+    """A parsed anniversary date, the year is None when it is unknown."""
+
+    calendar_type: str
+    year: int | None
+    month: int
+    day: int
+
+    @property
+    def unknown_year(self) -> bool:
+        """Return whether the anniversary was configured without a year."""
+        return self.year is None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(value: str, calendar_type: str) -> DateSpec | None:
+    """Parse a configured date, returning None if it is not a valid date of the calendar."""
+    start = time.perf_counter()
+    spec = _parse(value, calendar_type)
+    DATE_PARSE.observe(time.perf_counter() - start, calendar_type)
+    return spec
+
+
+register_cache("parse_date", parse_date.cache_info)
+
+
+def _parse(value: str, calendar_type: str) -> DateSpec | None:
+    """Parse a configured date, without caching."""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if calendar_type == CALENDAR_TYPE_HEBREW:
+        return _parse_hebrew(value)
+    match = _GREGORIAN.fullmatch(value)
+    if match is None:
+        return None
+    year, month, day = match.groups()
+    year = int(year) if year else None
+    try:
+        date(GREGORIAN_REFERENCE_YEAR if year is None else year, int(month), int(day))
+    except ValueError:
+        return None
+    return DateSpec(calendar_type, year, int(month), int(day))
+
+
+def _parse_hebrew(value: str) -> DateSpec | None:
+    """Parse a Hebrew date written with a month number or a month name."""
+    match = _HEBREW_NUMERIC.fullmatch(value)
+    if match is not None:
+        day, month, year = match.groups()
+        month = int(month)
+    else:
+        match = _HEBREW_NAMED.fullmatch(value)
+        if match is None:
+            return None
+        day, name, year = match.groups()
+        month = HEBREW_MONTHS.get(_SPACES.sub(" ", name.lower()))
+        if month is None:
+            return None
+    year = int(year) if year else None
+    try:
+        # The date must also fall within the Gregorian range of datetime
+        date.fromordinal(hebcal.to_ordinal(HEBREW_REFERENCE_YEAR if year is None else year, month, int(day)))
+    except ValueError:
+        return None
+    return DateSpec(CALENDAR_TYPE_HEBREW, year, month, int(day))
@@ -0,0 +1,29 @@
+"""Shared per-day context for the Anniversaries integration."""
+from datetime import date
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .const import DAY_CONTEXT, DOMAIN
+
+
+class DayContext:
+    """Everything about 'today' that every sensor would otherwise compute for itself."""
+
+    __slots__ = ("date",)
+
+    def __init__(self, today: date) -> None:
+        """Build the context for a local date."""
+        # Today's Hebrew date is looked up once through the conversion cache when the engine calculates
+        self.date = today
+
+
+def async_get_day_context(hass: HomeAssistant) -> DayContext:
+    """Return today's context in the Home Assistant time zone, rebuilding it on day rollover."""
+    today = dt_util.now().date()
+    data = hass.data.setdefault(DOMAIN, {})
+    context = data.get(DAY_CONTEXT)
+    if context is None or context.date != today:
+        context = DayContext(today)
+        data[DAY_CONTEXT] = context
+    return context
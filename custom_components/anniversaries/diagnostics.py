@@ -0,0 +1,16 @@
+"""Diagnostics support for Anniversaries."""
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONFIG_ENTRY_SENSORS, DOMAIN
+from .metrics import snapshot
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return the configuration of an entry, its sensor's state and the integration's metrics."""
+    sensor = hass.data.get(DOMAIN, {}).get(CONFIG_ENTRY_SENSORS, {}).get(entry.entry_id)
+    return {
+        "entry": {"title": entry.title, "data": dict(entry.data), "options": dict(entry.options)},
+        "sensor": None if sensor is None else {"entity_id": sensor.entity_id, "state": sensor.state},
+        "metrics": snapshot(hass),
+    }
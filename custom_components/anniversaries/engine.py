@@ -0,0 +1,312 @@
+"""Batch anniversary engine.
+
+Every configured anniversary is a row in a set of NumPy columns.  All rows are
+recomputed in one vectorized pass per day, rows changed during the day (template
+sensors) are recomputed on their own, and sensors only read their row.
+"""
+from calendar import isleap
+from datetime import date
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant
+import numpy as np
+
+from .const import DOMAIN, ENGINE
+from .dates import DateSpec
+from .hebrew import HebrewDay, next_hebrew_occurrence
+
+_INITIAL_CAPACITY = 64
+
+# Cumulative days before each month and days in each month, indexed by [leap year][month]
+_DAYS_BEFORE_MONTH = np.array(
+    [
+        [0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334],
+        [0, 0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335],
+    ],
+    dtype=np.int32,
+)
+_DAYS_IN_MONTH = np.array(
+    [
+        [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+        [0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+    ],
+    dtype=np.int32,
+)
+
+# Row flags
+FLAG_VALID = 1
+FLAG_ONE_TIME = 2
+FLAG_COUNT_UP = 4
+FLAG_HALF = 8
+FLAG_UNKNOWN_YEAR = 16
+FLAG_HEBREW = 32
+
+_INT_COLUMNS = (
+    # Inputs
+    "flags", "ordinal", "year", "month", "day", "half_ordinal", "half_year", "half_month", "half_day",
+    "hebrew_day", "hebrew_month", "hebrew_year",
+    # Results
+    "next_year", "next_month", "next_day", "state", "days", "years_next", "years_current",
+    "weeks", "half_days", "next_hebrew_year", "next_hebrew_month", "next_hebrew_day",
+)
+
+
+class AnniversaryResult(NamedTuple):
+    """Computed values of a single anniversary."""
+
+    date: date
+    next_date: date
+    days_remaining: int
+    state: int
+    years_next: int
+    years_current: int
+    weeks_remaining: int
+    half_date: date | None
+    half_days_remaining: int
+    next_hebrew_date: HebrewDay | None
+
+
+def _is_leap(year):
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def _ordinal(year, month, day):
+    """Vectorized date.toordinal()."""
+    before = year - 1
+    leap = _is_leap(year).astype(np.int32)
+    return before * 365 + before // 4 - before // 100 + before // 400 + _DAYS_BEFORE_MONTH[leap, month] + day
+
+
+def _clamp_day(year, month, day):
+    """Clamp a day to the length of its month (29 February becomes 28 February)."""
+    return np.minimum(day, _DAYS_IN_MONTH[_is_leap(year).astype(np.int32), month])
+
+
+def _in_year(year: int, month, day):
+    """Return the (clamped) day and the ordinal of (month, day) in a single year."""
+    leap = int(isleap(year))
+    day = np.minimum(day, _DAYS_IN_MONTH[leap][month])
+    return day, date(year, 1, 1).toordinal() - 1 + _DAYS_BEFORE_MONTH[leap][month] + day
+
+
+class AnniversaryEngine:
+    """Columnar store and vectorized calculation of all anniversaries."""
+
+    __slots__ = ("_free", "_size", "_computed_for", "_dirty") + _INT_COLUMNS
+
+    def __init__(self) -> None:
+        """Create an empty engine."""
+        self._size = 0
+        self._free: list[int] = []
+        self._computed_for: int | None = None
+        self._dirty: set[int] = set()
+        for column in _INT_COLUMNS:
+            setattr(self, column, np.zeros(_INITIAL_CAPACITY, dtype=np.int32))
+
+    def __len__(self) -> int:
+        """Return the number of rows in use."""
+        return self._size - len(self._free)
+
+    def add(self) -> int:
+        """Allocate a row and return its index."""
+        if self._free:
+            return self._free.pop()
+        if self._size == len(self.flags):
+            for column in _INT_COLUMNS:
+                setattr(self, column, np.resize(getattr(self, column), 2 * self._size))
+        row = self._size
+        self._size += 1
+        self.flags[row] = 0
+        return row
+
+    def remove(self, row: int) -> None:
+        """Release a row."""
+        self.flags[row] = 0
+        self._dirty.discard(row)
+        self._free.append(row)
+
+    def set_row(
+        self,
+        row: int,
+        origin: date | None,
+        *,
+        unknown_year: bool = False,
+        one_time: bool = False,
+        count_up: bool = False,
+        half_date: date | None = None,
+        hebrew: DateSpec | None = None,
+    ) -> None:
+        """Store the inputs of a row, an origin of None marks the row invalid."""
+        if origin is None:
+            self.flags[row] = 0
+            self._dirty.discard(row)
+            return
+        flags = FLAG_VALID
+        if unknown_year:
+            flags |= FLAG_UNKNOWN_YEAR
+        if one_time:
+            flags |= FLAG_ONE_TIME
+        if count_up:
+            flags |= FLAG_COUNT_UP
+        if half_date is not None:
+            flags |= FLAG_HALF
+            self.half_ordinal[row] = half_date.toordinal()
+            self.half_year[row], self.half_month[row], self.half_day[row] = half_date.year, half_date.month, half_date.day
+        if hebrew is not None:
+            flags |= FLAG_HEBREW
+            self.hebrew_day[row] = hebrew.day
+            self.hebrew_month[row] = hebrew.month
+            self.hebrew_year[row] = hebrew.year or 0
+        self.flags[row] = flags
+        self.ordinal[row] = origin.toordinal()
+        self.year[row], self.month[row], self.day[row] = origin.year, origin.month, origin.day
+        self._dirty.add(row)
+
+    def compute(self, today: date) -> None:
+        """Bring every row up to date, in one pass on a new day or only the changed rows otherwise."""
+        ordinal = today.toordinal()
+        if self._computed_for != ordinal:
+            rows = np.flatnonzero(self.flags[: self._size] & FLAG_VALID)
+        elif self._dirty:
+            rows = np.fromiter(self._dirty, dtype=np.int32)
+        else:
+            return
+        self._dirty.clear()
+        self._computed_for = ordinal
+        if len(rows):
+            self._compute_rows(rows, today)
+
+    def result(self, row: int, today: date) -> AnniversaryResult | None:
+        """Return the values of a row computed for today, None if the row is invalid."""
+        self.compute(today)
+        flags = int(self.flags[row])
+        if not flags & FLAG_VALID:
+            return None
+        half_date = None
+        if flags & FLAG_HALF:
+            half_date = date(int(self.half_year[row]), int(self.half_month[row]), int(self.half_day[row]))
+        next_hebrew_date = None
+        if self.next_hebrew_year[row]:
+            next_hebrew_date = HebrewDay(
+                int(self.next_hebrew_year[row]), int(self.next_hebrew_month[row]), int(self.next_hebrew_day[row])
+            )
+        return AnniversaryResult(
+            date=date(int(self.year[row]), int(self.month[row]), int(self.day[row])),
+            next_date=date(int(self.next_year[row]), int(self.next_month[row]), int(self.next_day[row])),
+            days_remaining=int(self.days[row]),
+            state=int(self.state[row]),
+            years_next=int(self.years_next[row]),
+            years_current=int(self.years_current[row]),
+            weeks_remaining=int(self.weeks[row]),
+            half_date=half_date,
+            half_days_remaining=int(self.half_days[row]),
+            next_hebrew_date=next_hebrew_date,
+        )
+
+    def _compute_rows(self, rows: np.ndarray, today: date) -> None:
+        """Vectorized calculation of the given rows."""
+        today_ordinal = today.toordinal()
+        this_year = today.year
+        flags = self.flags[rows]
+        origin = self.ordinal[rows]
+        year, month, day = self.year[rows], self.month[rows], self.day[rows]
+        recurring = (flags & FLAG_ONE_TIME) == 0
+
+        # Gregorian recurrence: the anniversary this year and next year
+        day_this_year, this_year_ordinal = _in_year(this_year, month, day)
+        day_next_year, next_year_ordinal = _in_year(this_year + 1, month, day)
+        years = this_year - year + (today_ordinal >= this_year_ordinal)
+
+        use_this_year = recurring & (today_ordinal >= origin)
+        next_ordinal = np.where(use_this_year, this_year_ordinal, origin)
+        next_year = np.where(use_this_year, this_year, year)
+        next_day = np.where(use_this_year, day_this_year, day)
+        use_next_year = recurring & (today_ordinal > next_ordinal)
+        next_ordinal = np.where(use_next_year, next_year_ordinal, next_ordinal)
+        next_year = np.where(use_next_year, this_year + 1, next_year)
+        next_day = np.where(use_next_year, day_next_year, next_day)
+        next_month = month.copy()
+
+        # Hebrew recurrence: one cached lookup per distinct (day, month)
+        next_hebrew = np.zeros((3, len(rows)), dtype=np.int32)
+        for index in np.flatnonzero(flags & FLAG_HEBREW):
+            row = rows[index]
+            try:
+                occurrence, hebrew_day = next_hebrew_occurrence(
+                    int(self.hebrew_day[row]), int(self.hebrew_month[row]), today_ordinal
+                )
+            except ValueError:
+                # Fall back to the Gregorian calculation
+                continue
+            gregorian = date.fromordinal(occurrence)
+            next_ordinal[index] = occurrence
+            next_year[index], next_month[index], next_day[index] = gregorian.year, gregorian.month, gregorian.day
+            next_hebrew[:, index] = hebrew_day
+            years[index] = hebrew_day.year - self.hebrew_year[row] if self.hebrew_year[row] else 0
+
+        days = next_ordinal - today_ordinal
+        state = days.copy()
+        count_up = np.flatnonzero(flags & FLAG_COUNT_UP)
+        if len(count_up):
+            # Count up from the previous occurrence
+            since = next_ordinal[count_up]
+            previous = np.flatnonzero((days[count_up] > 0) & recurring[count_up])
+            if len(previous):
+                index = count_up[previous]
+                previous_year = next_year[index] - 1
+                since[previous] = _ordinal(
+                    previous_year, next_month[index], _clamp_day(previous_year, next_month[index], next_day[index])
+                )
+            state[count_up] = today_ordinal - since
+
+        half = np.flatnonzero(flags & FLAG_HALF)
+        if len(half):
+            half_rows = rows[half]
+            half_ordinal = self.half_ordinal[half_rows]
+            half_year, half_month, half_day = self.half_year[half_rows], self.half_month[half_rows], self.half_day[half_rows]
+            half_this_year, half_this_year_ordinal = _in_year(this_year, half_month, half_day)
+            half_next_year, half_next_year_ordinal = _in_year(this_year + 1, half_month, half_day)
+            passed = today_ordinal > half_ordinal
+            half_ordinal = np.where(passed, half_this_year_ordinal, half_ordinal)
+            half_year = np.where(passed, this_year, half_year)
+            half_day_next = np.where(passed, half_this_year, half_day)
+            passed = today_ordinal > half_ordinal
+            half_ordinal = np.where(passed, half_next_year_ordinal, half_ordinal)
+            half_year = np.where(passed, this_year + 1, half_year)
+            half_day_next = np.where(passed, half_next_year, half_day_next)
+            self.half_days[half_rows] = half_ordinal - today_ordinal
+            # The next half anniversary becomes the base of the following calculation
+            self.half_ordinal[half_rows] = half_ordinal
+            self.half_year[half_rows] = half_year
+            self.half_day[half_rows] = half_day_next
+
+        # The date of rows with an unknown year follows the next occurrence
+        unknown = np.flatnonzero(flags & FLAG_UNKNOWN_YEAR)
+        if len(unknown):
+            unknown_rows = rows[unknown]
+            self.ordinal[unknown_rows] = next_ordinal[unknown]
+            self.year[unknown_rows] = next_year[unknown]
+            self.month[unknown_rows] = next_month[unknown]
+            self.day[unknown_rows] = next_day[unknown]
+
+        self.next_year[rows] = next_year
+        self.next_month[rows] = next_month
+        self.next_day[rows] = next_day
+        self.days[rows] = days
+        self.state[rows] = state
+        self.years_next[rows] = years - (days == 0)
+        self.years_current[rows] = years - 1
+        # int() truncation of the original calculation
+        self.weeks[rows] = np.where(days < 0, -(-days // 7), days // 7)
+        self.next_hebrew_year[rows] = next_hebrew[0]
+        self.next_hebrew_month[rows] = next_hebrew[1]
+        self.next_hebrew_day[rows] = next_hebrew[2]
+
+
+def async_get_engine(hass: HomeAssistant) -> AnniversaryEngine:
+    """Return the engine shared by all anniversary sensors."""
+    data = hass.data.setdefault(DOMAIN, {})
+    engine = data.get(ENGINE)
+    if engine is None:
+        engine = data[ENGINE] = AnniversaryEngine()
+    return engine
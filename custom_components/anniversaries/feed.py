@@ -0,0 +1,120 @@
+"""iCalendar (RFC 5545) feed of every anniversary, written one event at a time."""
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Iterator
+
+from .calendar import HALF_ANNIVERSARY_SUMMARY
+from .const import CALENDAR_NAME, CALENDAR_TYPE_HEBREW, VERSION
+
+PRODID = f"-//Anniversaries {VERSION}//Home Assistant//EN"
+# Content lines are folded at 75 octets
+MAX_LINE_OCTETS = 75
+# Occurrences looked at to tell a 29 February anniversary, there is a leap year in any 8 consecutive years
+LEAP_LOOKAHEAD = 8
+
+
+def _text(value: str) -> str:
+    """Escape an iCalendar TEXT value."""
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    """Return a content line folded at 75 octets, without splitting a UTF-8 character, ending with CRLF."""
+    encoded = line.encode()
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    start, limit = 0, MAX_LINE_OCTETS
+    while len(encoded) - start > limit:
+        end = start + limit
+        # Back off to the first byte of a character
+        while encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        # Continuation lines start with a space, which counts towards their 75 octets
+        start, limit = end, MAX_LINE_OCTETS - 1
+    parts.append(encoded[start:].decode())
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _date(value: date) -> str:
+    """Return an iCalendar DATE value."""
+    return value.strftime("%Y%m%d")
+
+
+def _event(
+    uid: str, stamp: str, start: date, summary: str, description: str | None = None, rrule: str | None = None
+) -> str:
+    """Return one all-day VEVENT."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{_date(start)}",
+        f"DTEND;VALUE=DATE:{_date(start + timedelta(days=1))}",
+        f"SUMMARY:{_text(summary)}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{_text(description)}")
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    lines.extend(("TRANSP:TRANSPARENT", "END:VEVENT"))
+    return "".join(map(_fold, lines))
+
+
+def _recurring(occurrences: Iterator[date], uid: str, stamp: str, last: date, summary: str) -> Iterator[str]:
+    """Yield a Gregorian anniversary as one event with a yearly rule, or a single event if it does not recur."""
+    upcoming = list(islice(occurrences, LEAP_LOOKAHEAD))
+    if not upcoming or upcoming[0] > last:
+        return
+    rrule = None
+    if len(upcoming) > 1:
+        rrule = f"FREQ=YEARLY;UNTIL={_date(last)}"
+        if any(day.month == 2 and day.day == 29 for day in upcoming):
+            # 29 February falls on 28 February in common years, the last day of February
+            rrule = f"FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=-1;UNTIL={_date(last)}"
+    yield _event(uid, stamp, upcoming[0], summary, rrule=rrule)
+
+
+def entity_events(entity, first: date, last: date, stamp: str) -> Iterator[str]:
+    """Yield the VEVENTs of one anniversary sensor between two dates."""
+    uid = f"{entity.entity_id}@anniversaries"
+    if entity.calendar_type == CALENDAR_TYPE_HEBREW:
+        # Hebrew anniversaries move in the Gregorian calendar, every occurrence is an event
+        for start in entity.occurrences(first):
+            if start > last:
+                break
+            description = f"Hebrew date: {entity.hebrew_date_on(start)}"
+            yield _event(f"{_date(start)}-{uid}", stamp, start, entity.name, description)
+    else:
+        yield from _recurring(entity.occurrences(first), uid, stamp, last, entity.name)
+    yield from _recurring(
+        entity.half_occurrences(first), f"half-{uid}", stamp, last, HALF_ANNIVERSARY_SUMMARY.format(entity.name)
+    )
+
+
+def feed_header() -> str:
+    """Return the start of the calendar."""
+    return "".join(
+        map(
+            _fold,
+            (
+                "BEGIN:VCALENDAR",
+                "VERSION:2.0",
+                f"PRODID:{PRODID}",
+                "CALSCALE:GREGORIAN",
+                "METHOD:PUBLISH",
+                f"X-WR-CALNAME:{_text(CALENDAR_NAME)}",
+            ),
+        )
+    )
+
+
+def feed_footer() -> str:
+    """Return the end of the calendar."""
+    return _fold("END:VCALENDAR")
+
+
+def format_stamp(value: datetime) -> str:
+    """Return an iCalendar UTC DATE-TIME value, for DTSTAMP."""
+    return value.strftime("%Y%m%dT%H%M%SZ")
@@ -0,0 +1,240 @@
+"""Anniversaries loaded in bulk from a CSV, YAML or ICS file."""
+import csv
+from datetime import timedelta
+import logging
+import os
+from typing import Iterator
+
+import voluptuous as vol
+import yaml
+
+from homeassistant.const import CONF_NAME, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_CALENDAR_TYPE,
+    CONF_COUNT_UP,
+    CONF_DATE,
+    CONF_DATE_SPEC,
+    CONF_EVENT_TYPE,
+    CONF_HALF_ANNIVERSARY,
+    CONF_ICON_NORMAL,
+    CONF_ICON_SOON,
+    CONF_ICON_TODAY,
+    CONF_ID_PREFIX,
+    CONF_ONE_TIME,
+    CONF_SOON,
+    CONF_UNIT_OF_MEASUREMENT,
+    SENSOR_SCHEMA,
+)
+from .sensor import anniversaries
+from .tracing import TRACER
+
+_LOGGER = logging.getLogger(__name__)
+
+FILE_SCAN_INTERVAL = timedelta(minutes=1)
+
+# File state before the first load, different from any stat result including a missing file
+_NOT_LOADED = ()
+
+# Columns taken from a file row, anything else (notes, phone numbers...) is ignored
+FILE_ROW_KEYS = (
+    CONF_NAME,
+    CONF_DATE,
+    CONF_CALENDAR_TYPE,
+    CONF_EVENT_TYPE,
+    CONF_SOON,
+    CONF_ICON_NORMAL,
+    CONF_ICON_TODAY,
+    CONF_ICON_SOON,
+    CONF_HALF_ANNIVERSARY,
+    CONF_UNIT_OF_MEASUREMENT,
+    CONF_ID_PREFIX,
+    CONF_ONE_TIME,
+    CONF_COUNT_UP,
+)
+
+
+def _iter_csv(path: str) -> Iterator[tuple[int, dict]]:
+    """Yield (line, row) for every row of a CSV file with a header line."""
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, {
+                key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()
+            }
+
+
+def _iter_yaml(path: str) -> Iterator[tuple[int, dict]]:
+    """Yield (document, row) for every mapping of a YAML file, one document at a time."""
+    with open(path, encoding="utf-8") as file:
+        for number, document in enumerate(yaml.safe_load_all(file), 1):
+            if document is None:
+                continue
+            for row in document if isinstance(document, list) else [document]:
+                yield number, row
+
+
+def _unfold(lines) -> Iterator[tuple[int, str]]:
+    """Join folded iCalendar content lines, yielding (line, content line)."""
+    number, current = 0, None
+    for index, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield number, current
+        number, current = index, line
+    if current is not None:
+        yield number, current
+
+
+def _ics_text(value: str) -> str:
+    """Unescape an iCalendar TEXT value."""
+    return value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+
+def _iter_ics(path: str) -> Iterator[tuple[int, dict]]:
+    """Yield (line, row) for every VEVENT of an iCalendar file, yearly events recur."""
+    event = None
+    start = 0
+    with open(path, encoding="utf-8") as file:
+        for number, line in _unfold(file):
+            name, _, value = line.partition(":")
+            name = name.split(";", 1)[0].upper()
+            if name == "BEGIN" and value == "VEVENT":
+                event, start = {CONF_ONE_TIME: True}, number
+            elif event is None:
+                continue
+            elif name == "END" and value == "VEVENT":
+                yield start, event
+                event = None
+            elif name == "SUMMARY":
+                event[CONF_NAME] = _ics_text(value)
+            elif name == "DTSTART" and len(value) >= 8:
+                event[CONF_DATE] = f"{value[0:4]}-{value[4:6]}-{value[6:8]}"
+            elif name == "RRULE" and "FREQ=YEARLY" in value.upper():
+                event[CONF_ONE_TIME] = False
+
+
+FILE_READERS = {
+    ".csv": _iter_csv,
+    ".yaml": _iter_yaml,
+    ".yml": _iter_yaml,
+    ".ics": _iter_ics,
+}
+
+
+def load_file(path: str) -> dict[str, dict]:
+    """Parse and validate an anniversaries file, returning the sensor configuration of each name."""
+    reader = FILE_READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        raise ValueError(f"Unsupported anniversaries file type: {path}")
+    with TRACER.span("load_file", "setup", {"path": path}):
+        return _load_rows(path, reader)
+
+
+def _load_rows(path: str, reader) -> dict[str, dict]:
+    """Validate the rows of an anniversaries file."""
+    rows = {}
+    for number, row in reader(path):
+        if not isinstance(row, dict):
+            _LOGGER.warning(f"{path}:{number}: skipping anniversary that is not a mapping")
+            continue
+        try:
+            config = SENSOR_SCHEMA({key: value for key, value in row.items() if key in FILE_ROW_KEYS})
+        except vol.Invalid as err:
+            _LOGGER.warning(f"{path}:{number}: skipping invalid anniversary: {err}")
+            continue
+        if CONF_DATE not in config:
+            _LOGGER.warning(f"{path}:{number}: skipping anniversary without a date")
+            continue
+        if config[CONF_DATE_SPEC] is None:
+            _LOGGER.warning(f"{path}:{number}: skipping invalid date: {config[CONF_DATE]}")
+            continue
+        if config[CONF_NAME] in rows:
+            _LOGGER.warning(f"{path}:{number}: duplicate anniversary {config[CONF_NAME]}, keeping the last one")
+        rows[config[CONF_NAME]] = config
+    return rows
+
+
+class AnniversariesFileSource:
+    """Keep one sensor per row of a file, syncing only the rows that changed."""
+
+    __slots__ = "_hass", "_path", "_async_add_entities", "_entities", "_stat", "_unsub"
+
+    def __init__(self, hass: HomeAssistant, path: str, async_add_entities) -> None:
+        """Initialize a file source."""
+        self._hass = hass
+        self._path = hass.config.path(path)
+        self._async_add_entities = async_add_entities
+        self._entities: dict[str, anniversaries] = {}
+        self._stat = _NOT_LOADED
+        self._unsub = None
+
+    async def async_start(self) -> None:
+        """Load the file and watch it for changes."""
+        await self._async_check()
+        self._unsub = async_track_time_interval(self._hass, self._async_check, FILE_SCAN_INTERVAL)
+        self._hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self.async_stop)
+
+    @callback
+    def async_stop(self, event=None) -> None:
+        """Stop watching the file."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _file_stat(self) -> tuple | None:
+        """Return the modification time and size of the file, None if it is missing."""
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def _async_check(self, now=None) -> None:
+        """Sync the sensors if the file changed since it was last loaded."""
+        stat = await self._hass.async_add_executor_job(self._file_stat)
+        if stat == self._stat:
+            return
+        if stat is None:
+            _LOGGER.error(f"Anniversaries file not found: {self._path}")
+            self._stat = stat
+            return
+        try:
+            rows = await self._hass.async_add_executor_job(load_file, self._path)
+        except (OSError, ValueError, yaml.YAMLError, csv.Error) as err:
+            _LOGGER.error(f"Could not load anniversaries file {self._path}: {err}")
+            return
+        self._stat = stat
+        await self._async_sync(rows)
+
+    async def _async_sync(self, rows: dict[str, dict]) -> None:
+        """Add, update or remove the sensors whose rows differ from the loaded ones."""
+        removed = updated = 0
+        for name, entity in list(self._entities.items()):
+            config = rows.get(name)
+            if config == entity.config:
+                continue
+            # Changed rows are applied to the live sensor, which keeps its state and history
+            if config is not None and entity.hass is not None and entity.async_reconfigure(config):
+                updated += 1
+                continue
+            # Deleted rows, and changed rows whose entity ID has to change, are removed
+            await self._entities.pop(name).async_remove()
+            removed += config is None
+        entities = []
+        with TRACER.span("create_sensors", "setup", {"path": self._path}):
+            for name, config in rows.items():
+                if name not in self._entities:
+                    entity = anniversaries(self._hass, config)
+                    self._entities[name] = entity
+                    entities.append(entity)
+        if entities:
+            self._async_add_entities(entities)
+        _LOGGER.debug(
+            f"Synced {self._path}: {len(entities)} added, {updated} updated, {removed} removed"
+        )
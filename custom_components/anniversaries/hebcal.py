@@ -0,0 +1,125 @@
+"""Integer-only Hebrew calendar arithmetic.
+
+Dates are exchanged as Gregorian ordinals (``date.toordinal()``) and Hebrew
+(year, month, day) triples using the hdate month numbering:
+Tishrei=1, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14.
+"""
+from functools import lru_cache
+
+# Gregorian ordinal of 1 Tishrei AM 1 (7 October 3761 BCE, proleptic Julian)
+HEBREW_EPOCH = -1373427
+
+# Molad arithmetic, in parts (1080 parts per hour)
+PARTS_PER_DAY = 25920
+MOLAD_BEHARAD = 12084  # Parts elapsed in the week at the first molad
+MONTH_PARTS = 13753  # Parts in a lunar month beyond 29 days
+
+TISHREI = 1
+CHESHVAN = 2
+KISLEV = 3
+ADAR = 6
+ADAR_I = 7
+ADAR_II = 8
+ELUL = 14
+
+# Length of each month, Cheshvan and Kislev depend on the year length
+_FIXED_MONTH_LENGTHS = (0, 30, 0, 0, 29, 30, 29, 30, 29, 30, 29, 30, 29, 30, 29)
+
+_REGULAR_YEAR_MONTHS = (1, 2, 3, 4, 5, 6, 9, 10, 11, 12, 13, 14)
+_LEAP_YEAR_MONTHS = (1, 2, 3, 4, 5, 7, 8, 9, 10, 11, 12, 13, 14)
+
+
+def is_leap_year(year: int) -> bool:
+    """Return True if the Hebrew year has two Adars."""
+    return (7 * year + 1) % 19 < 7
+
+
+def _elapsed_days(year: int) -> int:
+    """Days from the epoch to the molad of Tishrei, after the Lo ADU Rosh postponement."""
+    months_elapsed = (235 * year - 234) // 19
+    parts_elapsed = MOLAD_BEHARAD + MONTH_PARTS * months_elapsed
+    days = 29 * months_elapsed + parts_elapsed // PARTS_PER_DAY
+    # Rosh Hashanah may not fall on Sunday, Wednesday or Friday
+    if (3 * (days + 1)) % 7 < 3:
+        days += 1
+    return days
+
+
+def _new_year_delay(year: int) -> int:
+    """Extra postponement keeping every year length within the legal range."""
+    this_year = _elapsed_days(year)
+    if _elapsed_days(year + 1) - this_year == 356:
+        return 2
+    if this_year - _elapsed_days(year - 1) == 382:
+        return 1
+    return 0
+
+
+@lru_cache(maxsize=1024)
+def rosh_hashana(year: int) -> int:
+    """Return the Gregorian ordinal of 1 Tishrei of a Hebrew year."""
+    return HEBREW_EPOCH + _elapsed_days(year) + _new_year_delay(year)
+
+
+def year_length(year: int) -> int:
+    """Return the number of days in a Hebrew year."""
+    return rosh_hashana(year + 1) - rosh_hashana(year)
+
+
+def months_in_year(year: int) -> tuple:
+    """Return the month numbers of a Hebrew year, in calendar order."""
+    return _LEAP_YEAR_MONTHS if is_leap_year(year) else _REGULAR_YEAR_MONTHS
+
+
+def month_lengths(year: int) -> tuple:
+    """Return the length of every month indexed by month number, 0 if it does not exist that year."""
+    length = year_length(year)
+    lengths = list(_FIXED_MONTH_LENGTHS)
+    # Long Cheshvan in complete years (355/385), short Kislev in deficient years (353/383)
+    lengths[CHESHVAN] = 30 if length % 10 == 5 else 29
+    lengths[KISLEV] = 29 if length % 10 == 3 else 30
+    if is_leap_year(year):
+        lengths[ADAR] = 0
+    else:
+        lengths[ADAR_I] = 0
+        lengths[ADAR_II] = 0
+    return tuple(lengths)
+
+
+def to_ordinal(year: int, month: int, day: int) -> int:
+    """Convert a Hebrew date to a Gregorian ordinal, raising ValueError if it does not exist."""
+    if not TISHREI <= month <= ELUL:
+        raise ValueError(f"{month} is not a valid Hebrew month")
+    lengths = month_lengths(year)
+    if not lengths[month]:
+        raise ValueError(f"Month {month} does not exist in Hebrew year {year}")
+    if not 0 < day <= lengths[month]:
+        raise ValueError(f"Day {day} is illegal: legal values are 1-{lengths[month]} for month {month}")
+    ordinal = rosh_hashana(year) + day - 1
+    for earlier in months_in_year(year):
+        if earlier == month:
+            break
+        ordinal += lengths[earlier]
+    return ordinal
+
+
+def from_ordinal(ordinal: int) -> tuple:
+    """Convert a Gregorian ordinal to a Hebrew (year, month, day)."""
+    # Average Hebrew year is 35975351/98496 days, the estimate is at most one year off
+    year = (ordinal - HEBREW_EPOCH) * 98496 // 35975351 + 1
+    start = rosh_hashana(year)
+    if start > ordinal:
+        year -= 1
+        start = rosh_hashana(year)
+    else:
+        following = rosh_hashana(year + 1)
+        if following <= ordinal:
+            year += 1
+            start = following
+    day = ordinal - start
+    lengths = month_lengths(year)
+    for month in months_in_year(year):
+        if day < lengths[month]:
+            return year, month, day + 1
+        day -= lengths[month]
+    raise ValueError(f"Ordinal {ordinal} is outside Hebrew year {year}")
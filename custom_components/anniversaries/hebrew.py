@@ -0,0 +1,197 @@
+"""Hebrew calendar helpers shared by the Anniversaries sensors."""
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+import logging
+import time
+from typing import Iterator, NamedTuple
+
+from . import hebcal
+from .const import HEBREW_ENGINE_HDATE, HEBREW_ENGINE_NATIVE
+from .metrics import HEBREW_CONVERSION, register_cache
+from .tracing import TRACER
+
+# hdate is slow to import, it is only loaded when its engine is selected
+HebrewDate = None
+Months = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of Hebrew years kept in the year-structure cache
+YEAR_CACHE_SIZE = 64
+# Number of dates kept in each conversion cache
+CONVERSION_CACHE_SIZE = 4096
+
+# Using hdate library month numbering: Tishrei=1, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14
+MONTHS_IN_YEAR = 14
+
+
+class HebrewYear:
+    """Structure of a single Hebrew year."""
+
+    __slots__ = "year", "leap", "month_lengths", "length", "rosh_hashana"
+
+    def __init__(self, year: int) -> None:
+        """Compute the structure of a Hebrew year."""
+        self.year = year
+        if _engine == HEBREW_ENGINE_NATIVE:
+            self.leap = hebcal.is_leap_year(year)
+            # Index by month number, months that do not exist this year are 0
+            self.month_lengths = hebcal.month_lengths(year)
+            self.rosh_hashana = hebcal.rosh_hashana(year)
+        else:
+            rosh_hashana = HebrewDate(year=year, month=1, day=1)
+            self.leap = rosh_hashana.is_leap_year()
+            self.month_lengths = (0,) + tuple(
+                Months(month).days(year) if _month_in_year(month, self.leap) else 0
+                for month in range(1, MONTHS_IN_YEAR + 1)
+            )
+            self.rosh_hashana = rosh_hashana.to_gdate().toordinal()
+        self.length = sum(self.month_lengths)
+
+
+def _month_in_year(month: int, leap: bool) -> bool:
+    """Return whether a month number exists in a leap or a regular year."""
+    if month == 6:
+        return not leap
+    if month in (7, 8):
+        return leap
+    return True
+
+
+_YEAR_CACHE: "OrderedDict[int, HebrewYear]" = OrderedDict()
+_engine = HEBREW_ENGINE_NATIVE
+
+
+def import_hdate() -> bool:
+    """Import the hdate library, returning False if it is not installed. Blocking, run it in the executor."""
+    global HebrewDate, Months
+    if HebrewDate is None:
+        try:
+            with TRACER.span("import_hdate", "setup"):
+                from hdate import HebrewDate, Months
+        except ImportError:
+            return False
+    return True
+
+
+def set_engine(engine: str) -> None:
+    """Select the native arithmetic or the hdate library (imported beforehand) for all conversions."""
+    global _engine
+    if engine == HEBREW_ENGINE_HDATE and HebrewDate is None:
+        _LOGGER.warning("hdate library not available, using the native Hebrew calendar")
+        engine = HEBREW_ENGINE_NATIVE
+    if engine != _engine:
+        _engine = engine
+        clear_caches()
+
+
+def clear_caches() -> None:
+    """Drop every cached year and conversion."""
+    _YEAR_CACHE.clear()
+    hebrew_to_ordinal.cache_clear()
+    ordinal_to_hebrew.cache_clear()
+    next_hebrew_occurrence.cache_clear()
+
+
+def get_hebrew_year(year: int) -> HebrewYear:
+    """Return the (cached) structure of a Hebrew year."""
+    info = _YEAR_CACHE.get(year)
+    if info is not None:
+        _YEAR_CACHE.move_to_end(year)
+        return info
+    info = HebrewYear(year)
+    _YEAR_CACHE[year] = info
+    if len(_YEAR_CACHE) > YEAR_CACHE_SIZE:
+        _YEAR_CACHE.popitem(last=False)
+    return info
+
+
+class HebrewDay(NamedTuple):
+    """A plain Hebrew (year, month, day)."""
+
+    year: int
+    month: int
+    day: int
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def hebrew_to_ordinal(year: int, month: int, day: int) -> int:
+    """Convert a Hebrew date to a Gregorian ordinal, raising ValueError if it does not exist."""
+    start = time.perf_counter()
+    if _engine == HEBREW_ENGINE_NATIVE:
+        ordinal = hebcal.to_ordinal(year, month, day)
+    else:
+        ordinal = HebrewDate(year=year, month=month, day=day).to_gdate().toordinal()
+    HEBREW_CONVERSION.observe(time.perf_counter() - start, "hebrew_to_ordinal")
+    return ordinal
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def ordinal_to_hebrew(ordinal: int) -> HebrewDay:
+    """Convert a Gregorian ordinal to a Hebrew date."""
+    start = time.perf_counter()
+    if _engine == HEBREW_ENGINE_NATIVE:
+        hebrew = HebrewDay(*hebcal.from_ordinal(ordinal))
+    else:
+        hdate_obj = HebrewDate.from_gdate(date.fromordinal(ordinal))
+        hebrew = HebrewDay(hdate_obj.year, int(hdate_obj.month), hdate_obj.day)
+    HEBREW_CONVERSION.observe(time.perf_counter() - start, "ordinal_to_hebrew")
+    return hebrew
+
+
+def handle_adar_month(month: int, year: int) -> int:
+    """Map an Adar month onto the Adar that exists in a Hebrew year."""
+    is_leap = get_hebrew_year(year).leap
+
+    # Month 6 is Adar in non-leap years, but in leap years we have Adar I (7) and Adar II (8)
+    # For birthdays/anniversaries in Adar, halachic custom is to celebrate in Adar II in leap years
+    if month == 6 and is_leap:
+        return 8  # Adar II
+    elif month == 7 and not is_leap:
+        return 6  # Adar I becomes regular Adar in non-leap years
+    elif month == 8 and not is_leap:
+        return 6  # Adar II becomes regular Adar in non-leap years
+
+    return month
+
+
+def max_day_in_month(month: int, year: int) -> int:
+    """Get maximum day in a Hebrew month."""
+    # Months that do not exist in this year have no length
+    return get_hebrew_year(year).month_lengths[month] or 29
+
+
+def _occurrence_in_year(day: int, month: int, year: int) -> tuple[int, HebrewDay]:
+    """Return the anniversary of (day, month) in a Hebrew year."""
+    target_month = handle_adar_month(month, year)
+    # Handle day overflow (e.g., 30th of a 29-day month)
+    actual_day = min(day, max_day_in_month(target_month, year))
+    return hebrew_to_ordinal(year, target_month, actual_day), HebrewDay(year, target_month, actual_day)
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def next_hebrew_occurrence(day: int, month: int, reference: int) -> tuple[int, HebrewDay]:
+    """Return the first anniversary of (day, month) after the reference Gregorian ordinal."""
+    start = time.perf_counter()
+    current_year = ordinal_to_hebrew(reference).year
+    ordinal, hebrew_day = _occurrence_in_year(day, month, current_year)
+    # If the date has passed this year, use next Hebrew year
+    if ordinal <= reference:
+        ordinal, hebrew_day = _occurrence_in_year(day, month, current_year + 1)
+    HEBREW_CONVERSION.observe(time.perf_counter() - start, "next_hebrew_occurrence")
+    return ordinal, hebrew_day
+
+
+def hebrew_occurrences(day: int, month: int, first: int) -> Iterator[tuple[int, HebrewDay]]:
+    """Yield every anniversary of (day, month) from a Gregorian ordinal onwards, in order."""
+    year = ordinal_to_hebrew(first).year
+    while True:
+        ordinal, hebrew_day = _occurrence_in_year(day, month, year)
+        if ordinal >= first:
+            yield ordinal, hebrew_day
+        year += 1
+
+
+for _cached in (hebrew_to_ordinal, ordinal_to_hebrew, next_hebrew_occurrence):
+    register_cache(_cached.__name__, _cached.cache_info)
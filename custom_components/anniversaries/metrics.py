@@ -0,0 +1,195 @@
+"""Counters and timing histograms of the integration's hot paths.
+
+Metrics are process wide, like the conversion caches they report on.  They are
+exported in the Prometheus text format by the metrics view and as a mapping in
+the config entry diagnostics.
+"""
+from bisect import bisect_left
+from typing import Callable
+
+from homeassistant.core import HomeAssistant
+
+from .const import CALENDAR_PLATFORM, COORDINATOR, DOMAIN, ENGINE
+
+# Upper bounds of the timing histogram buckets, in seconds
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_METRICS: list = []
+# lru_cache-style cache_info() callables, by cache name
+_CACHES: dict[str, Callable] = {}
+
+
+class Counter:
+    """A monotonic count, optionally split by the value of one label."""
+
+    __slots__ = "name", "description", "label", "values"
+
+    def __init__(self, name: str, description: str, label: str | None = None) -> None:
+        """Create and register a counter."""
+        self.name = name
+        self.description = description
+        self.label = label
+        self.values: dict[str | None, int] = {}
+        _METRICS.append(self)
+
+    def inc(self, label_value: str | None = None, amount: int = 1) -> None:
+        """Add to the count."""
+        self.values[label_value] = self.values.get(label_value, 0) + amount
+
+
+class _Series:
+    """Bucket counts, sum and count of one histogram series."""
+
+    __slots__ = "buckets", "sum", "count"
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """A distribution of durations, optionally split by the value of one label."""
+
+    __slots__ = "name", "description", "label", "series"
+
+    def __init__(self, name: str, description: str, label: str | None = None) -> None:
+        """Create and register a histogram."""
+        self.name = name
+        self.description = description
+        self.label = label
+        self.series: dict[str | None, _Series] = {}
+        _METRICS.append(self)
+
+    def observe(self, seconds: float, label_value: str | None = None) -> None:
+        """Record one duration."""
+        series = self.series.get(label_value)
+        if series is None:
+            series = self.series[label_value] = _Series()
+        series.buckets[bisect_left(BUCKETS, seconds)] += 1
+        series.sum += seconds
+        series.count += 1
+
+
+def register_cache(name: str, cache_info: Callable) -> None:
+    """Report the hit rate of a cache, from a callable returning (hits, misses, maxsize, currsize)."""
+    _CACHES[name] = cache_info
+
+
+def reset() -> None:
+    """Zero every counter and histogram."""
+    for metric in _METRICS:
+        if isinstance(metric, Counter):
+            metric.values.clear()
+        else:
+            metric.series.clear()
+
+
+REFRESH = Histogram("anniversaries_refresh_seconds", "Time to recalculate a batch of sensors")
+SENSOR_UPDATE = Histogram(
+    "anniversaries_sensor_update_seconds", "Time to prepare and read one sensor in a refresh, by date path", "path"
+)
+DATE_PARSE = Histogram("anniversaries_date_parse_seconds", "Uncached parses of a configured date, by calendar", "calendar")
+HEBREW_CONVERSION = Histogram(
+    "anniversaries_hebrew_conversion_seconds", "Uncached Hebrew calendar conversions, by conversion", "conversion"
+)
+CALENDAR_QUERY = Histogram("anniversaries_calendar_query_seconds", "Time to list the calendar events of a window")
+CALENDAR_EVENTS = Counter("anniversaries_calendar_events_total", "Calendar events returned, by event cache result", "cache")
+TEMPLATE_RENDERS = Counter("anniversaries_template_renders_total", "Date template renderings, by result", "result")
+
+
+def _gauges(hass: HomeAssistant) -> dict[str, tuple[str, float]]:
+    """Return the current gauge values, by name, with their description."""
+    data = hass.data.get(DOMAIN, {})
+    gauges = {}
+    coordinator = data.get(COORDINATOR)
+    if coordinator is not None:
+        gauges["anniversaries_sensors"] = ("Sensors driven by the coordinator", coordinator.entity_count)
+        if coordinator.last_refresh is not None:
+            gauges["anniversaries_last_refresh_timestamp_seconds"] = (
+                "Time of the last refresh",
+                coordinator.last_refresh.timestamp(),
+            )
+            gauges["anniversaries_last_refresh_duration_seconds"] = (
+                "Duration of the last refresh",
+                coordinator.last_refresh_duration,
+            )
+    engine = data.get(ENGINE)
+    if engine is not None:
+        gauges["anniversaries_engine_rows"] = ("Rows in use in the anniversary engine", len(engine))
+    calendar = data.get(CALENDAR_PLATFORM)
+    if calendar is not None:
+        gauges["anniversaries_calendar_upcoming"] = ("Sensors with an upcoming calendar event", calendar.upcoming_count)
+    return gauges
+
+
+def _caches() -> dict[str, dict]:
+    """Return the hit, miss and size counts of every registered cache."""
+    caches = {}
+    for name, cache_info in _CACHES.items():
+        info = cache_info()
+        caches[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+    return caches
+
+
+def snapshot(hass: HomeAssistant) -> dict:
+    """Return every metric as plain values, for the diagnostics download."""
+    result = {"gauges": {name: value for name, (_, value) in _gauges(hass).items()}, "caches": _caches()}
+    for metric in _METRICS:
+        if isinstance(metric, Counter):
+            result[metric.name] = {str(label): value for label, value in metric.values.items()}
+        else:
+            result[metric.name] = {
+                str(label): {
+                    "count": series.count,
+                    "sum": series.sum,
+                    "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], series.buckets)),
+                }
+                for label, series in metric.series.items()
+            }
+    return result
+
+
+def _labels(metric, label_value, extra: str = "") -> str:
+    """Return the label set of a series, in the text format."""
+    labels = [] if label_value is None else [f'{metric.label}="{label_value}"']
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def render_text(hass: HomeAssistant) -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _METRICS:
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        if isinstance(metric, Counter):
+            lines.append(f"# TYPE {metric.name} counter")
+            for label_value, value in metric.values.items():
+                lines.append(f"{metric.name}{_labels(metric, label_value)} {value}")
+            continue
+        lines.append(f"# TYPE {metric.name} histogram")
+        for label_value, series in metric.series.items():
+            cumulative = 0
+            for bound, count in zip([*map(str, BUCKETS), "+Inf"], series.buckets):
+                cumulative += count
+                bucket_labels = _labels(metric, label_value, f'le="{bound}"')
+                lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{metric.name}_sum{_labels(metric, label_value)} {series.sum}")
+            lines.append(f"{metric.name}_count{_labels(metric, label_value)} {series.count}")
+    caches = _caches()
+    for field, kind, description in (
+        ("hits", "counter", "Cache hits"),
+        ("misses", "counter", "Cache misses"),
+        ("size", "gauge", "Entries in the cache"),
+    ):
+        name = f"anniversaries_cache_{field}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {name} {description}, by cache")
+        lines.append(f"# TYPE {name} {kind}")
+        for cache, info in caches.items():
+            lines.append(f'{name}{{cache="{cache}"}} {info[field]}')
+    for name, (description, value) in _gauges(hass).items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
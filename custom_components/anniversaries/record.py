@@ -0,0 +1,143 @@
+"""Compact state of one anniversary, the sensor entity is a view over it."""
+from datetime import date
+from enum import IntEnum
+from functools import lru_cache
+
+from .dates import DateSpec
+from .engine import AnniversaryResult
+from .hebrew import HebrewDay
+
+# Record flags
+FLAG_UNKNOWN_YEAR = 1
+FLAG_ONE_TIME = 2
+FLAG_COUNT_UP = 4
+FLAG_HALF = 8
+FLAG_TEMPLATE = 16
+# The engine row must be rewritten before the next calculation
+FLAG_ROW_STALE = 32
+# Set by prepare() when there is a result for calculate() to read
+FLAG_PREPARED = 64
+
+
+class Validity(IntEnum):
+    """Whether the anniversary's date can be calculated."""
+
+    # A template sensor before its template has rendered
+    PENDING = 0
+    VALID = 1
+    INVALID_DATE = 2
+    INVALID_TEMPLATE = 3
+
+
+# The day's ordinal, one int shared by every record calculated that day
+_day_ordinal = lru_cache(maxsize=2)(date.toordinal)
+
+# State shown for each invalid date
+INVALID_STATES = {Validity.INVALID_DATE: "Invalid Date", Validity.INVALID_TEMPLATE: "Invalid Template"}
+
+
+class AnniversaryRecord:
+    """Fixed layout of an anniversary's inputs and results, dates are Gregorian ordinals.
+
+    Results are only meaningful once `day`, the ordinal they were calculated for, is set.
+    The next dates are kept as days from `day`, which are mostly small cached ints.
+    """
+
+    __slots__ = (
+        "flags",
+        "validity",
+        "origin",
+        "date",
+        "hebrew",
+        "row",
+        "day",
+        "days",
+        "state",
+        "years_next",
+        "years_current",
+        "weeks",
+        "half_days",
+        "next_hebrew",
+        "config_key",
+        "previous",
+        "prepare_seconds",
+    )
+
+    def __init__(self) -> None:
+        """Create an empty record."""
+        self.flags = FLAG_ROW_STALE
+        self.validity = Validity.PENDING
+        # Configured date of the anniversary, what the engine calculates from
+        self.origin = 0
+        # Date shown, this year's occurrence once calculated if the year is unknown
+        self.date = 0
+        # Parsed Hebrew date of a configured Hebrew anniversary
+        self.hebrew: DateSpec | None = None
+        # Row in the anniversary engine
+        self.row: int | None = None
+        self.day: int | None = None
+        self.days = 0
+        self.state = 0
+        self.years_next = 0
+        self.years_current = 0
+        self.weeks = 0
+        self.half_days = 0
+        self.next_hebrew: HebrewDay | None = None
+        self.config_key: str | None = None
+        # Shown values before prepare(), compared by calculate()
+        self.previous: tuple | None = None
+        self.prepare_seconds = 0.0
+
+    @property
+    def next_date(self) -> int | None:
+        """Return the ordinal of the next anniversary, None until calculated."""
+        return None if self.day is None else self.day + self.days
+
+    @property
+    def half_date(self) -> int | None:
+        """Return the ordinal of the next half anniversary, None until calculated."""
+        return None if self.day is None else self.day + self.half_days
+
+    def set_date(self, value: date | None, unknown_year: bool = False) -> None:
+        """Set the origin of the anniversary, None if the configured date is invalid."""
+        if value is None:
+            self.validity = Validity.INVALID_DATE
+            return
+        self.validity = Validity.VALID
+        self.origin = self.date = value.toordinal()
+        if unknown_year:
+            self.flags |= FLAG_UNKNOWN_YEAR
+        else:
+            self.flags &= ~FLAG_UNKNOWN_YEAR
+        self.flags |= FLAG_ROW_STALE
+
+    def apply(self, result: AnniversaryResult, today: date) -> bool:
+        """Store a calculated or restored result, returning whether the dates shown in the calendar changed."""
+        before = self.date, self.next_date, self.next_hebrew
+        self.day = _day_ordinal(today)
+        self.days = result.days_remaining
+        if self.flags & FLAG_UNKNOWN_YEAR:
+            self.date = result.date.toordinal()
+        self.state = result.state
+        self.years_next = result.years_next
+        self.years_current = result.years_current
+        self.weeks = result.weeks_remaining
+        if self.flags & FLAG_HALF:
+            self.half_days = result.half_days_remaining
+        self.next_hebrew = result.next_hebrew_date if self.hebrew is not None else None
+        return (self.date, self.next_date, self.next_hebrew) != before
+
+    def result(self) -> AnniversaryResult:
+        """Return the stored result, to be saved."""
+        return AnniversaryResult(
+            date=date.fromordinal(self.date),
+            next_date=date.fromordinal(self.next_date),
+            days_remaining=self.days,
+            state=self.state,
+            years_next=self.years_next,
+            years_current=self.years_current,
+            weeks_remaining=self.weeks,
+            half_date=date.fromordinal(self.half_date) if self.flags & FLAG_HALF else None,
+            half_days_remaining=self.half_days,
+            next_hebrew_date=self.next_hebrew,
+        )
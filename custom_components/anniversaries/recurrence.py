@@ -0,0 +1,29 @@
+"""Expansion of anniversaries into their recurrences."""
+from calendar import isleap, monthrange
+from datetime import MAXYEAR, date
+from typing import Iterator
+
+# A leap year before every anniversary, yearless anniversaries recur from it so 29 February is kept
+YEARLESS_YEAR = 4
+
+
+def yearly_occurrences(origin: date, first: date) -> Iterator[date]:
+    """Yield every Gregorian anniversary of origin from first onwards, in order."""
+    year = max(origin.year, first.year)
+    while year <= MAXYEAR:
+        # Like relativedelta, 29 February falls on 28 February in common years
+        if origin.month == 2 and origin.day == 29 and not isleap(year):
+            occurrence = date(year, 2, 28)
+        else:
+            occurrence = date(year, origin.month, origin.day)
+        if occurrence >= first:
+            yield occurrence
+        year += 1
+
+
+def add_months(value: date, months: int) -> date:
+    """Move a date or datetime by whole months, clamping the day to the end of the month like relativedelta."""
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, monthrange(year, month)[1]))
@@ -1,14 +1,39 @@
 """ Sensor """
-from dateutil.relativedelta import relativedelta
-from datetime import datetime, date
+from datetime import date
+from functools import lru_cache
 
 import logging
+import time
+from types import MappingProxyType
 
 from homeassistant.helpers.entity import Entity, generate_entity_id
 from homeassistant.components.sensor import ENTITY_ID_FORMAT
+from homeassistant.core import callback
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import template as templater
-import homeassistant.util.dt as dt_util
+from homeassistant.helpers.event import TrackTemplate, async_track_template_result
 from .calendar import EntitiesCalendarData
+from .coordinator import async_get_coordinator
+from .dates import GREGORIAN_REFERENCE_YEAR, HEBREW_MONTH_NAMES, HEBREW_REFERENCE_YEAR, parse_date
+from .day_context import async_get_day_context
+from .engine import async_get_engine
+from .hebrew import hebrew_occurrences, hebrew_to_ordinal, ordinal_to_hebrew
+from .metrics import SENSOR_UPDATE, TEMPLATE_RENDERS, register_cache
+from .record import (
+    FLAG_COUNT_UP,
+    FLAG_HALF,
+    FLAG_ONE_TIME,
+    FLAG_PREPARED,
+    FLAG_ROW_STALE,
+    FLAG_TEMPLATE,
+    FLAG_UNKNOWN_YEAR,
+    INVALID_STATES,
+    AnniversaryRecord,
+    Validity,
+)
+from .recurrence import YEARLESS_YEAR, add_months, yearly_occurrences
+from .store import config_hash
+from .tracing import TRACER
 from homeassistant.helpers.discovery import async_load_platform
 
 from homeassistant.const import (
@@ -16,12 +41,6 @@ from homeassistant.const import (
     ATTR_ATTRIBUTION,
 )
 
-try:
-    from hdate import HebrewDate, Months
-    HDATE_AVAILABLE = True
-except ImportError:
-    HDATE_AVAILABLE = False
-
 _LOGGER = logging.getLogger(__name__)
 
 from .const import (
@@ -32,6 +51,9 @@ from .const import (
     CONF_ICON_SOON,
     CONF_DATE,
     CONF_DATE_TEMPLATE,
+    CONF_DATE_SPEC,
+    CONF_FILE,
+    CONF_SENSORS,
     CONF_SOON,
     CONF_HALF_ANNIVERSARY,
     CONF_UNIT_OF_MEASUREMENT,
@@ -48,6 +70,7 @@ from .const import (
     SENSOR_PLATFORM,
     CALENDAR_PLATFORM,
     CALENDAR_NAME,
+    CONFIG_ENTRY_SENSORS,
 )
 
 ATTR_YEARS_NEXT = "years_at_anniversary"
@@ -62,343 +85,141 @@ ATTR_HEBREW_NEXT_DATE = "hebrew_next_date"
 ATTR_CALENDAR_TYPE = "calendar_type"
 ATTR_EVENT_TYPE = "event_type"
 ATTR_ICON = "icon"
+ATTR_TEMPLATE_ERROR = "template_error"
+
+# Distinct date strings kept, most sensors show dates of the coming year
+DATE_STRING_CACHE_SIZE = 4096
+# Attributes of a sensor that has no result yet, shared by all of them
+_NO_RESULT_ATTRIBUTES = MappingProxyType({ATTR_ATTRIBUTION: ATTRIBUTION})
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Setup the sensor platform."""
-    async_add_entities([anniversaries(hass, discovery_info)], True)
+    if CONF_FILE in discovery_info:
+        from .file_source import AnniversariesFileSource
+
+        await AnniversariesFileSource(hass, discovery_info[CONF_FILE], async_add_entities).async_start()
+        return
+    # The coordinator calculates new sensors together once they are added
+    configs = discovery_info[CONF_SENSORS]
+    with TRACER.span("create_sensors", "setup", {"sensors": len(configs)}):
+        entities = [anniversaries(hass, config) for config in configs]
+    async_add_entities(entities)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Setup sensor platform."""
-    async_add_devices([anniversaries(hass, config_entry.data)], True)
+    sensor = anniversaries(hass, config_entry.data)
+    # Kept so option changes can be applied to the live sensor
+    hass.data.setdefault(DOMAIN, {}).setdefault(CONFIG_ENTRY_SENSORS, {})[config_entry.entry_id] = sensor
+    async_add_devices([sensor])
 
 def validate_date(value, calendar_type=CALENDAR_TYPE_GREGORIAN):
-    """Validate date based on calendar type."""
-    if calendar_type == CALENDAR_TYPE_HEBREW:
-        return validate_hebrew_date_sensor(value)
-    else:
-        # Gregorian validation
-        try:
-            return datetime.strptime(value, "%Y-%m-%d"), False
-        except ValueError:
-            pass
-        try:
-            return datetime.strptime(value, "%m-%d"), True
-        except ValueError:
-                return "Invalid Date", False
-
-def validate_hebrew_date_sensor(value):
-    """Validate and parse Hebrew date."""
-    if not HDATE_AVAILABLE:
-        _LOGGER.warning(f"hdate library not available for Hebrew date validation: {value}")
-        return "Invalid Date", False
-    
-    _LOGGER.debug(f"Validating Hebrew date: {value}")
-    
-    try:
-        # Try format: DD-MM-YYYY (Hebrew date)
-        parts = value.split("-")
-        if len(parts) == 3:
-            day = int(parts[0])
-            month = int(parts[1])
-            year = int(parts[2])
-            hebrew_date = HebrewDate(year=year, month=month, day=day)
-            # Convert to Gregorian datetime
-            greg_date = hebrew_date.to_gdate()
-            greg_datetime = datetime(greg_date.year, greg_date.month, greg_date.day)
-            _LOGGER.debug(f"Successfully parsed Hebrew date (DD-MM-YYYY): {value} -> {greg_datetime}")
-            return greg_datetime, False  # False = year is known
-        
-        # Try format: DD-MM (Hebrew date without year)
-        if len(parts) == 2:
-            day = int(parts[0])
-            month = int(parts[1])
-            # Use a reference year to validate
-            hebrew_date = HebrewDate(year=5784, month=month, day=day)
-            greg_date = hebrew_date.to_gdate()
-            greg_datetime = datetime(greg_date.year, greg_date.month, greg_date.day)
-            _LOGGER.debug(f"Successfully parsed Hebrew date (DD-MM): {value} -> {greg_datetime}")
-            return greg_datetime, True  # True = year is unknown
-    except (ValueError, AttributeError) as e:
-        _LOGGER.debug(f"Failed to parse Hebrew date with dash format: {e}")
-        pass
-    
-    # Try format: "DD MonthName YYYY" or "DD MonthName"
-    try:
-        parts = value.split()
-        if len(parts) >= 2:
-            day = int(parts[0])
-            month_name = parts[1]
-            year = None
-            
-            # Handle "Adar I" and "Adar II" with space (e.g., "15 Adar I 5765" or "15 Adar II")
-            if len(parts) >= 3 and parts[1].lower() == 'adar' and parts[2].lower() in ('i', 'ii', '1', '2', 'א', 'ב'):
-                month_name = parts[1] + ' ' + parts[2]  # Combine "Adar" + "I" or "II"
-                if len(parts) == 4:
-                    year = int(parts[3])
-            elif len(parts) == 3:
-                year = int(parts[2])
-            
-            # Map month names to numbers (case-insensitive)
-            # Using hdate library month numbering: Tishrei=1, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14
-            month_map = {
-                "tishrei": 1, "תשרי": 1,
-                "cheshvan": 2, "marcheshvan": 2, "חשוון": 2, "מרחשוון": 2,
-                "kislev": 3, "כסלו": 3,
-                "tevet": 4, "טבת": 4,
-                "shevat": 5, "shvat": 5, "שבט": 5,
-                "adar": 6, "אדר": 6,
-                "adar1": 7, "adar_i": 7, "adar i": 7, "אדר א": 7,
-                "adar2": 8, "adar_ii": 8, "adar ii": 8, "אדר ב": 8,
-                "nisan": 9, "ניסן": 9,
-                "iyar": 10, "אייר": 10,
-                "sivan": 11, "סיוון": 11,
-                "tammuz": 12, "תמוז": 12,
-                "av": 13, "אב": 13,
-                "elul": 14, "אלול": 14,
-            }
-            
-            # Convert month name to lowercase for case-insensitive matching
-            month_name_lower = month_name.lower()
-            month_num = month_map.get(month_name_lower)
-            _LOGGER.debug(f"Parsed month name '{month_name}' -> '{month_name_lower}' -> {month_num}")
-            if month_num:
-                if year:
-                    _LOGGER.debug(f"Creating HebrewDate with day={day}, month={month_num}, year={year}")
-                    hebrew_date = HebrewDate(year=year, month=month_num, day=day)
-                    greg_date = hebrew_date.to_gdate()
-                    greg_datetime = datetime(greg_date.year, greg_date.month, greg_date.day)
-                    _LOGGER.debug(f"Successfully parsed Hebrew date (DD MonthName YYYY): {value} -> {greg_datetime}")
-                    return greg_datetime, False
-                else:
-                    # Use reference year
-                    hebrew_date = HebrewDate(year=5784, month=month_num, day=day)
-                    greg_date = hebrew_date.to_gdate()
-                    greg_datetime = datetime(greg_date.year, greg_date.month, greg_date.day)
-                    _LOGGER.debug(f"Successfully parsed Hebrew date (DD MonthName): {value} -> {greg_datetime}")
-                    return greg_datetime, True
-            else:
-                _LOGGER.warning(f"Month name not found in map: '{month_name}' (lowercase: '{month_name_lower}')")
-    except (ValueError, KeyError, AttributeError) as e:
-        _LOGGER.error(f"Error parsing Hebrew date '{value}': {e}", exc_info=True)
-        pass
-    
-    _LOGGER.warning(f"Could not validate Hebrew date: {value}")
-    return "Invalid Date", False
+    """Validate date based on calendar type, returning its Gregorian date (None if invalid) and whether its year is unknown."""
+    spec = parse_date(value, calendar_type)
+    if spec is None:
+        _LOGGER.debug(f"Could not validate {calendar_type} date: {value}")
+        return None, False
+    return spec_date(spec), spec.unknown_year
+
+def spec_date(spec):
+    """Return the Gregorian date of a parsed date, dates without a year fall in the reference year."""
+    if spec.calendar_type == CALENDAR_TYPE_HEBREW:
+        year = HEBREW_REFERENCE_YEAR if spec.year is None else spec.year
+        return date.fromordinal(hebrew_to_ordinal(year, spec.month, spec.day))
+    return date(GREGORIAN_REFERENCE_YEAR if spec.year is None else spec.year, spec.month, spec.day)
+
+@lru_cache(maxsize=DATE_STRING_CACHE_SIZE)
+def _date_string(ordinal):
+    """Format a date attribute (yyyy-mm-dd), once for all the sensors showing that date."""
+    return date.fromordinal(ordinal).strftime("%Y-%m-%d")
+
+register_cache("date_string", _date_string.cache_info)
+
+def _entity_id(config):
+    """Return the entity ID generated from a sensor's prefix and name."""
+    id_prefix = config.get(CONF_ID_PREFIX)
+    if id_prefix is None:
+        id_prefix = "anniversary_"
+    return generate_entity_id(ENTITY_ID_FORMAT, id_prefix + config.get(CONF_NAME), [])
 
 class anniversaries(Entity):
     def __init__(self, hass, config):
         """Initialize the sensor."""
+        self._template_date = None
+        self._template_info = None
+        self._template_result = None
+        self._template_error = None
+        # Everything calculated lives in the record, the entity keeps the attributes built from it
+        self._record = AnniversaryRecord()
+        self._attributes = _NO_RESULT_ATTRIBUTES
+        with TRACER.span("apply_config", "sensor"):
+            self._apply_config(config)
+        with TRACER.span("entity_id", "sensor"):
+            self.entity_id = _entity_id(config)
+
+    def _apply_config(self, config):
+        """Read the sensor's configuration into its record, when it is created and when its options change."""
         self.config = config
-        self._name = config.get(CONF_NAME)
-        self._id_prefix = config.get(CONF_ID_PREFIX)
-        if self._id_prefix is None:
-            self._id_prefix = "anniversary_"
-        self.entity_id = generate_entity_id(ENTITY_ID_FORMAT, self._id_prefix + self._name, [])
-        self._unknown_year = False
-        self._date = ""
-        self._calendar_type = config.get(CONF_CALENDAR_TYPE, DEFAULT_CALENDAR_TYPE)
-        self._hebrew_date = None  # Store original Hebrew date string
-        self._hebrew_date_obj = None  # Store parsed Hebrew date components
-        self._show_half_anniversary = config.get(CONF_HALF_ANNIVERSARY)
-        self._half_days_remaining = 0
-        self._half_date = ""
-        self._template_sensor = False
-        self._date_template = config.get(CONF_DATE_TEMPLATE)
-        if self._date_template is not None:
-            self._template_sensor = True
+        record = self._record
+        flags = FLAG_ROW_STALE
+        if config.get(CONF_ONE_TIME):
+            flags |= FLAG_ONE_TIME
+        if config.get(CONF_COUNT_UP):
+            flags |= FLAG_COUNT_UP
+        if config.get(CONF_HALF_ANNIVERSARY):
+            flags |= FLAG_HALF
+        record.hebrew = None
+        if config.get(CONF_DATE_TEMPLATE) is not None:
+            record.flags = flags | FLAG_TEMPLATE
+            record.validity = Validity.PENDING
+            # Parse the current rendering again at the next update
+            self._template_date = None
+            return
+        record.flags = flags
+        # YAML sensors arrive with the date already parsed by the schema
+        if CONF_DATE_SPEC in config:
+            spec = config[CONF_DATE_SPEC]
         else:
-            date_str = config.get(CONF_DATE)
-            self._date, self._unknown_year = validate_date(date_str, self._calendar_type)
-            
-            # Store Hebrew date information if using Hebrew calendar
-            if self._calendar_type == CALENDAR_TYPE_HEBREW and self._date != "Invalid Date":
-                self._hebrew_date = date_str
-                self._parse_hebrew_date(date_str)
-            
-            if self._date != "Invalid Date":
-                self._date = self._date.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-                if self._show_half_anniversary:
-                    self._half_date = self._date + relativedelta(months=+6)
-        self._icon_normal = config.get(CONF_ICON_NORMAL)
-        self._icon_today = config.get(CONF_ICON_TODAY)
-        self._icon_soon = config.get(CONF_ICON_SOON)
-        self._soon = config.get(CONF_SOON)
-        self._icon = self._icon_normal
-        self._years_next = 0
-        self._years_current = 0
-        self._state = 0
-        self._weeks_remaining = 0
-        self._unit_of_measurement = config.get(CONF_UNIT_OF_MEASUREMENT)
-        if self._unit_of_measurement is None:
-            self._unit_of_measurement = DEFAULT_UNIT_OF_MEASUREMENT
-        self._one_time = config.get(CONF_ONE_TIME)
-        self._count_up = config.get(CONF_COUNT_UP)
-        self._event_type = config.get(CONF_EVENT_TYPE, DEFAULT_EVENT_TYPE)
-
-    def _parse_hebrew_date(self, date_str):
-        """Parse Hebrew date string and store components."""
-        if not HDATE_AVAILABLE:
+            spec = parse_date(config.get(CONF_DATE), self.calendar_type)
+        if spec is None:
+            record.set_date(None)
             return
-        
-        try:
-            # Try format: DD-MM-YYYY or DD-MM
-            parts = date_str.split("-")
-            if len(parts) >= 2:
-                day = int(parts[0])
-                month = int(parts[1])
-                year = int(parts[2]) if len(parts) == 3 else None
-                self._hebrew_date_obj = {"day": day, "month": month, "year": year}
-                return
-        except (ValueError, KeyError):
-            pass
-        
-        try:
-            # Try format: "DD MonthName YYYY" or "DD MonthName"
-            parts = date_str.split()
-            if len(parts) >= 2:
-                day = int(parts[0])
-                month_name = parts[1]
-                year = None
-                
-                # Handle "Adar I" and "Adar II" with space (e.g., "15 Adar I 5765" or "15 Adar II")
-                if len(parts) >= 3 and parts[1].lower() == 'adar' and parts[2].lower() in ('i', 'ii', '1', '2', 'א', 'ב'):
-                    month_name = parts[1] + ' ' + parts[2]  # Combine "Adar" + "I" or "II"
-                    if len(parts) == 4:
-                        year = int(parts[3])
-                elif len(parts) == 3:
-                    year = int(parts[2])
-                
-                # Map month names to numbers (case-insensitive)
-                # Using hdate library month numbering: Tishrei=1, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14
-                month_map = {
-                    "tishrei": 1, "תשרי": 1,
-                    "cheshvan": 2, "marcheshvan": 2, "חשוון": 2, "מרחשוון": 2,
-                    "kislev": 3, "כסלו": 3,
-                    "tevet": 4, "טבת": 4,
-                    "shevat": 5, "shvat": 5, "שבט": 5,
-                    "adar": 6, "אדר": 6,
-                    "adar1": 7, "adar_i": 7, "adar i": 7, "אדר א": 7,
-                    "adar2": 8, "adar_ii": 8, "adar ii": 8, "אדר ב": 8,
-                    "nisan": 9, "ניסן": 9,
-                    "iyar": 10, "אייר": 10,
-                    "sivan": 11, "סיוון": 11,
-                    "tammuz": 12, "תמוז": 12,
-                    "av": 13, "אב": 13,
-                    "elul": 14, "אלול": 14,
-                }
-                
-                # Convert month name to lowercase for case-insensitive matching
-                month_name_lower = month_name.lower()
-                month_num = month_map.get(month_name_lower)
-                if month_num:
-                    self._hebrew_date_obj = {"day": day, "month": month_num, "year": year}
-        except (ValueError, KeyError):
-            pass
-
-    def _calculate_next_hebrew_anniversary(self, today):
-        """Calculate next occurrence of Hebrew anniversary."""
-        if not HDATE_AVAILABLE or not self._hebrew_date_obj:
-            return None
-        
-        try:
-            # Get today's Hebrew date
-            today_hdate = HebrewDate.from_gdate(today)
-            current_hyear = today_hdate.year
-            
-            day = self._hebrew_date_obj["day"]
-            month = self._hebrew_date_obj["month"]
-            original_year = self._hebrew_date_obj["year"]
-            
-            # Handle Adar in leap years (edge case)
-            target_month = self._handle_adar_month(month, current_hyear)
-            
-            # Try to create the anniversary for this Hebrew year
-            try:
-                # Handle day overflow (e.g., 30th of a 29-day month)
-                max_day = self._get_max_day_in_month(target_month, current_hyear)
-                actual_day = min(day, max_day)
-                
-                next_hdate = HebrewDate(year=current_hyear, month=target_month, day=actual_day)
-                next_gdate = next_hdate.to_gdate()
-                
-                # If the date has passed this year, use next Hebrew year
-                if next_gdate <= today:
-                    next_hyear = current_hyear + 1
-                    target_month = self._handle_adar_month(month, next_hyear)
-                    max_day = self._get_max_day_in_month(target_month, next_hyear)
-                    actual_day = min(day, max_day)
-                    next_hdate = HebrewDate(year=next_hyear, month=target_month, day=actual_day)
-                    next_gdate = next_hdate.to_gdate()
-                
-                return next_gdate, next_hdate
-            except (ValueError, AttributeError):
-                # If there's an error, try next year
-                next_hyear = current_hyear + 1
-                target_month = self._handle_adar_month(month, next_hyear)
-                max_day = self._get_max_day_in_month(target_month, next_hyear)
-                actual_day = min(day, max_day)
-                next_hdate = HebrewDate(year=next_hyear, month=target_month, day=actual_day)
-                next_gdate = next_hdate.to_gdate()
-                return next_gdate, next_hdate
-        except Exception as e:
-            _LOGGER.error(f"Error calculating Hebrew anniversary: {e}")
-            return None
-    
-    def _handle_adar_month(self, month, year):
-        """Handle Adar month in leap years."""
-        if not HDATE_AVAILABLE:
-            return month
-        
-        # Check if it's a leap year using HebrewDate
-        hd = HebrewDate(year=year, month=1, day=1)
-        is_leap = hd.is_leap_year()
-        
-        # Month 6 is Adar in non-leap years, but in leap years we have Adar I (7) and Adar II (8)
-        # For birthdays/anniversaries in Adar, halachic custom is to celebrate in Adar II in leap years
-        if month == 6 and is_leap:
-            return 8  # Adar II
-        elif month == 7 and not is_leap:
-            return 6  # Adar I becomes regular Adar in non-leap years
-        elif month == 8 and not is_leap:
-            return 6  # Adar II becomes regular Adar in non-leap years
-        
-        return month
-    
-    def _get_max_day_in_month(self, month, year):
-        """Get maximum day in a Hebrew month."""
-        if not HDATE_AVAILABLE:
-            return 30
-        
-        try:
-            # Use HebrewDate's days_in_month method with Months enum
-            hd = HebrewDate(year=year, month=month, day=1)
-            return hd.days_in_month(Months(month))
-        except (ValueError, AttributeError):
-            return 29
-    
+        record.set_date(spec_date(spec), spec.unknown_year)
+        if self.calendar_type == CALENDAR_TYPE_HEBREW:
+            record.hebrew = spec
+
+    @callback
+    def async_reconfigure(self, config):
+        """Apply changed options to the live sensor, returning False if its entity ID has to change."""
+        if dict(config) == dict(self.config):
+            return True
+        # Registered entities keep their entity ID whatever their name
+        if self.registry_entry is None and _entity_id(config) != self.entity_id:
+            return False
+        self._apply_config(config)
+        self._record.config_key = None
+        self._record.day = None
+        self.hass.data[DOMAIN][CALENDAR_PLATFORM].invalidate_events(self.entity_id)
+        async_get_coordinator(self.hass).async_refresh_entity(self)
+        # The name or unit may have changed even if the calculated values did not
+        self.async_write_ha_state()
+        return True
+
     def _format_hebrew_date(self, hdate_obj):
         """Format Hebrew date as string."""
         if not hdate_obj:
             return ""
-        
-        try:
-            # Get Hebrew month name
-            # Month numbering: Tishrei=1, Marcheshvan=2, ..., Adar=6, Adar_I=7, Adar_II=8, Nisan=9, ..., Elul=14
-            month_names = {
-                1: "Tishrei", 2: "Cheshvan", 3: "Kislev", 4: "Tevet", 5: "Shevat", 6: "Adar",
-                7: "Adar I", 8: "Adar II",
-                9: "Nisan", 10: "Iyar", 11: "Sivan", 12: "Tammuz", 13: "Av", 14: "Elul"
-            }
-            
-            day = hdate_obj.day
-            month_value = hdate_obj.month.value
-            year = hdate_obj.year
-            
-            month_name = month_names.get(month_value, str(month_value))
-            
-            return f"{day} {month_name} {year}"
-        except (AttributeError, IndexError):
-            return ""
+        month_value = int(hdate_obj.month)
+        month_name = HEBREW_MONTH_NAMES[month_value] if 0 < month_value < len(HEBREW_MONTH_NAMES) else str(month_value)
+        return f"{hdate_obj.day} {month_name} {hdate_obj.year}"
+
+    def hebrew_date_on(self, day):
+        """Return the Hebrew date of a Gregorian day, formatted as in the attributes."""
+        return self._format_hebrew_date(ordinal_to_hebrew(day.toordinal()))
+
+    @property
+    def should_poll(self):
+        """Sensors are refreshed at local midnight, template sensors also when their template's inputs change."""
+        return False
 
     @property
     def unique_id(self):
@@ -408,192 +229,358 @@ class anniversaries(Entity):
     @property
     def name(self):
         """Return the name of the sensor."""
-        return self._name
+        return self.config.get(CONF_NAME)
+
+    @property
+    def calendar_type(self):
+        """Return the calendar the date is expressed in."""
+        return self.config.get(CONF_CALENDAR_TYPE, DEFAULT_CALENDAR_TYPE)
+
+    @property
+    def event_type(self):
+        """Return the kind of anniversary."""
+        return self.config.get(CONF_EVENT_TYPE, DEFAULT_EVENT_TYPE)
+
+    @property
+    def valid(self):
+        """Return True if the sensor has a date to calculate."""
+        return self._record.validity == Validity.VALID
+
+    @property
+    def unknown_year(self):
+        """Return True if the year of the date is unknown."""
+        return bool(self._record.flags & FLAG_UNKNOWN_YEAR)
+
+    @property
+    def years_next(self):
+        """Return the years completed at the next anniversary."""
+        return self._record.years_next
+
+    @property
+    def next_date(self):
+        """Return the date of the next anniversary, None until it is calculated."""
+        record = self._record
+        if record.day is None:
+            return None
+        return date.fromordinal(record.next_date)
+
+    @property
+    def hebrew_date(self):
+        """Return the configured date of a Hebrew anniversary."""
+        if self._record.hebrew is None:
+            return None
+        return self.config.get(CONF_DATE)
+
+    @property
+    def next_hebrew_date(self):
+        """Return the Hebrew date of the next Hebrew anniversary."""
+        if self._record.next_hebrew is None:
+            return None
+        return self._format_hebrew_date(self._record.next_hebrew)
 
     @property
     def state(self):
         """Return the name of the sensor."""
-        return self._state
+        record = self._record
+        if record.validity in INVALID_STATES:
+            return INVALID_STATES[record.validity]
+        if record.day is None:
+            return None
+        return record.state
 
     @property
     def extra_state_attributes(self):
-        """Return the state attributes."""
+        """Return the state attributes, built at the end of the last update."""
+        return self._attributes
+
+    def _build_attributes(self):
+        """Build the immutable state attributes from the record."""
+        record = self._record
+        if record.validity in INVALID_STATES:
+            if self._template_error is None:
+                return _NO_RESULT_ATTRIBUTES
+            return MappingProxyType({ATTR_ATTRIBUTION: ATTRIBUTION, ATTR_TEMPLATE_ERROR: self._template_error})
+        if record.day is None:
+            return _NO_RESULT_ATTRIBUTES
         res = {}
         res[ATTR_ATTRIBUTION] = ATTRIBUTION
-        if self._state in ["Invalid Date", "Invalid Template"]:
-            return res
-        if not self._unknown_year:
-            res[ATTR_YEARS_NEXT] = self._years_next
-            res[ATTR_YEARS_CURRENT] = self._years_current
-        
-        # Convert datetime objects to simple date format (yyyy-mm-dd)
-        res[ATTR_DATE] = self._date.strftime("%Y-%m-%d") if isinstance(self._date, datetime) else self._date
-        res[ATTR_NEXT_DATE] = self._next_date.strftime("%Y-%m-%d") if isinstance(self._next_date, datetime) else self._next_date
-        res[ATTR_WEEKS] = self._weeks_remaining
-        res[ATTR_CALENDAR_TYPE] = self._calendar_type
-        res[ATTR_EVENT_TYPE] = self._event_type
-        res[ATTR_ICON] = self._icon
-        
+        if not record.flags & FLAG_UNKNOWN_YEAR:
+            res[ATTR_YEARS_NEXT] = record.years_next
+            res[ATTR_YEARS_CURRENT] = record.years_current
+
+        # Dates are shown in simple date format (yyyy-mm-dd)
+        res[ATTR_DATE] = _date_string(record.date)
+        res[ATTR_NEXT_DATE] = _date_string(record.next_date)
+        res[ATTR_WEEKS] = record.weeks
+        res[ATTR_CALENDAR_TYPE] = self.calendar_type
+        res[ATTR_EVENT_TYPE] = self.event_type
+        res[ATTR_ICON] = self.icon
+
         # Add Hebrew calendar attributes - always include for consistency
-        if self._calendar_type == CALENDAR_TYPE_HEBREW:
-            res[ATTR_HEBREW_DATE] = self._hebrew_date if self._hebrew_date else ""
-            res[ATTR_HEBREW_NEXT_DATE] = self._next_hebrew_date if hasattr(self, '_next_hebrew_date') and self._next_hebrew_date else ""
-        else:
-            res[ATTR_HEBREW_DATE] = ""
-            res[ATTR_HEBREW_NEXT_DATE] = ""
-        
-        if self._show_half_anniversary:
-            res[ATTR_HALF_DATE] = self._half_date.strftime("%Y-%m-%d") if isinstance(self._half_date, datetime) else self._half_date
-            res[ATTR_HALF_DAYS] = self._half_days_remaining
-        return res
+        res[ATTR_HEBREW_DATE] = self.hebrew_date or ""
+        res[ATTR_HEBREW_NEXT_DATE] = self.next_hebrew_date or ""
+
+        if record.flags & FLAG_HALF:
+            res[ATTR_HALF_DATE] = _date_string(record.half_date)
+            res[ATTR_HALF_DAYS] = record.half_days
+        return MappingProxyType(res)
 
     @property
     def icon(self):
-        return self._icon
+        record = self._record
+        if record.day is None:
+            return self.config.get(CONF_ICON_NORMAL)
+        if record.days == 0:
+            return self.config.get(CONF_ICON_TODAY)
+        if record.days <= self.config.get(CONF_SOON):
+            return self.config.get(CONF_ICON_SOON)
+        return self.config.get(CONF_ICON_NORMAL)
 
     @property
     def unit_of_measurement(self):
         """Return the unit this state is expressed in."""
-        if self._state in ["Invalid Date", "Invalid Template"]:
+        if self._record.validity in INVALID_STATES:
             return
-        return self._unit_of_measurement
+        unit = self.config.get(CONF_UNIT_OF_MEASUREMENT)
+        return DEFAULT_UNIT_OF_MEASUREMENT if unit is None else unit
 
     async def async_update(self):
         """update the sensor"""
-        if self._template_sensor:
-            try:
-                template_date = templater.Template(self._date_template, self.hass).async_render()
-                self._date, self._unknown_year = validate_date(template_date, self._calendar_type)
-                if self._date == "Invalid Date":
-                    self._state = self._date
-                    return
-                self._date = self._date.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-            except:
-                self._state = "Invalid Template"
-                return
-        
-        # Check if date is invalid for non-template sensors
-        if self._date == "Invalid Date":
-            self._state = self._date
+        if self._template_info is not None:
+            self._template_info.async_refresh()
+        self.prepare()
+        self.calculate()
+
+    def prepare(self):
+        """Pass changed inputs to the engine, so a batch of sensors is calculated in one pass."""
+        start = time.perf_counter()
+        record = self._record
+        record.previous = self.state, self._attributes
+        if self._prepare():
+            record.flags |= FLAG_PREPARED
+        record.prepare_seconds = time.perf_counter() - start
+
+    def calculate(self):
+        """Read the prepared sensor's results, returning True if its state or attributes changed."""
+        start = time.perf_counter()
+        record = self._record
+        if record.flags & FLAG_PREPARED:
+            record.flags &= ~FLAG_PREPARED
+            self._read_result()
+        self._attributes = self._build_attributes()
+        SENSOR_UPDATE.observe(record.prepare_seconds + time.perf_counter() - start, self._update_path)
+        changed = (self.state, self._attributes) != record.previous
+        record.previous = None
+        record.prepare_seconds = 0.0
+        return changed
+
+    @property
+    def _update_path(self):
+        """Return the date path timed in the update metrics."""
+        if self._record.flags & FLAG_TEMPLATE:
+            return "template"
+        return self.calendar_type
+
+    def _prepare(self):
+        """Render the template and update the engine row, returning False if the date is invalid."""
+        record = self._record
+        if record.flags & FLAG_TEMPLATE:
+            if self._template_error is not None:
+                self._template_date = None
+                record.validity = Validity.INVALID_TEMPLATE
+                self._update_calendar(None)
+                return False
+            template_date = self._template_result
+            if template_date != self._template_date:
+                self._template_date = template_date
+                record.set_date(*validate_date(template_date, self.calendar_type))
+                # Events built from the previous date are stale
+                self._update_calendar(None, True)
+
+        if record.validity != Validity.VALID:
+            self._update_calendar(None)
+            return False
+
+        engine = async_get_engine(self.hass)
+        if record.row is None:
+            record.row = engine.add()
+            record.flags |= FLAG_ROW_STALE
+        if record.flags & FLAG_ROW_STALE:
+            record.flags &= ~FLAG_ROW_STALE
+            # A restored result has moved the shown date of unknown-year anniversaries
+            origin = date.fromordinal(record.origin)
+            engine.set_row(
+                record.row,
+                origin,
+                unknown_year=bool(record.flags & FLAG_UNKNOWN_YEAR),
+                one_time=bool(record.flags & FLAG_ONE_TIME),
+                count_up=bool(record.flags & FLAG_COUNT_UP),
+                half_date=add_months(origin, 6) if record.flags & FLAG_HALF else None,
+                hebrew=record.hebrew,
+            )
+        return True
+
+    @property
+    def config_key(self):
+        """Return the hash identifying this sensor's configuration in saved results."""
+        record = self._record
+        if record.config_key is None:
+            record.config_key = config_hash(self.config)
+        return record.config_key
+
+    def saved_result(self):
+        """Return (configuration hash, day, result) to save, None for template or invalid sensors."""
+        record = self._record
+        if record.flags & FLAG_TEMPLATE or record.day is None:
+            return None
+        return self.config_key, date.fromordinal(record.day), record.result()
+
+    def restore(self, result, today):
+        """Show a result saved by the previous run, returning False if the sensor must be calculated."""
+        record = self._record
+        if record.flags & FLAG_TEMPLATE or record.validity != Validity.VALID:
+            return False
+        self._apply_result(result, today)
+        self._attributes = self._build_attributes()
+        return True
+
+    def _read_result(self):
+        """Copy the engine's results for this sensor."""
+        # All anniversaries are calculated together, once per day
+        today = async_get_day_context(self.hass).date
+        self._apply_result(async_get_engine(self.hass).result(self._record.row, today), today)
+
+    def _apply_result(self, result, today):
+        """Show a calculated or restored result."""
+        changed = self._record.apply(result, today)
+        # One-time events that have passed are no longer upcoming
+        self._update_calendar(result.next_date if result.days_remaining >= 0 else None, changed)
+
+    def occurrences(self, first):
+        """Yield the dates of this anniversary from first onwards, in order."""
+        record = self._record
+        origin = date.fromordinal(record.origin)
+        spec = record.hebrew
+        # Hebrew anniversaries recur even when one-time, as in the engine
+        if spec is not None:
+            start = first.toordinal()
+            if spec.year:
+                start = max(start, origin.toordinal())
+            for ordinal, _ in hebrew_occurrences(spec.day, spec.month, start):
+                yield date.fromordinal(ordinal)
             return
+        if record.flags & FLAG_ONE_TIME:
+            if origin >= first:
+                yield origin
+            return
+        if record.flags & FLAG_UNKNOWN_YEAR:
+            origin = origin.replace(year=YEARLESS_YEAR)
+        yield from yearly_occurrences(origin, first)
 
-        today = date.today()
-        
-        # Use Hebrew calendar calculation if calendar type is Hebrew
-        if self._calendar_type == CALENDAR_TYPE_HEBREW and HDATE_AVAILABLE and self._hebrew_date_obj:
-            result = self._calculate_next_hebrew_anniversary(today)
-            if result:
-                nextDate, next_hdate = result
-                # Calculate years if original year is known
-                if self._hebrew_date_obj["year"]:
-                    years = next_hdate.year - self._hebrew_date_obj["year"]
-                else:
-                    years = 0
-                    self._unknown_year = True
-            else:
-                # Fallback to Gregorian calculation
-                years = today.year - self._date.year
-                nextDate = self._date.date()
-                next_hdate = None
-                
-                if today >= self._date.date() + relativedelta(year=today.year):
-                    years = years + 1
-                    
-                if not self._one_time:
-                    if today >= nextDate:
-                        nextDate = self._date.date() + relativedelta(year=today.year)
-                    if today > nextDate:
-                        nextDate = self._date.date() + relativedelta(year=today.year + 1)
-        else:
-            # Gregorian calendar calculation (original logic)
-            years = today.year - self._date.year
-            nextDate = self._date.date()
-            next_hdate = None
-
-            if today >= self._date.date() + relativedelta(year=today.year):
-                years = years + 1
-                
-            if not self._one_time:
-                if today >= nextDate:
-                    nextDate = self._date.date() + relativedelta(year=today.year)
-                if today > nextDate:
-                    nextDate = self._date.date() + relativedelta(year=today.year + 1)
-
-        self._next_date = datetime.combine(nextDate, datetime.min.time())
-        self._next_date = self._next_date.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-        daysRemaining = (nextDate - today).days
-        
-        if self._unknown_year:
-            self._date = datetime(nextDate.year, nextDate.month, nextDate.day)
-            self._date = self._date.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-
-        if daysRemaining == 0:
-            self._icon = self._icon_today
-        elif daysRemaining <= self._soon:
-            self._icon = self._icon_soon
-        else:
-            self._icon = self._icon_normal
+    def half_occurrences(self, first):
+        """Yield the dates of this half anniversary from first onwards, in order."""
+        record = self._record
+        if not record.flags & FLAG_HALF:
+            return
+        origin = add_months(date.fromordinal(record.origin), 6)
+        # Half anniversaries recur even when one-time, as in the engine, and a yearless
+        # Hebrew date's only from the reference year on
+        if record.flags & FLAG_UNKNOWN_YEAR and record.hebrew is None:
+            origin = origin.replace(year=YEARLESS_YEAR)
+        yield from yearly_occurrences(origin, first)
 
-        self._state = daysRemaining
-        if daysRemaining == 0:
-            self._years_next = years - 1
-        else:
-            self._years_next = years
-        self._years_current = years - 1
-        self._weeks_remaining = int(daysRemaining / 7)
-
-        if self._count_up:
-            if daysRemaining > 0 and not self._one_time:
-                nextDate = nextDate + relativedelta(years=-1)
-            self._state = (today - nextDate).days
-
-        if self._show_half_anniversary:
-            nextHalfDate = self._half_date.date()
-            if today > nextHalfDate:
-                nextHalfDate = self._half_date.date() + relativedelta(year = today.year)
-            if today > nextHalfDate:
-                nextHalfDate = self._half_date.date() + relativedelta(year = today.year + 1)
-            self._half_days_remaining = (nextHalfDate - today).days
-            self._half_date = datetime(nextHalfDate.year, nextHalfDate.month, nextHalfDate.day)
-            self._half_date = self._half_date.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-        
-        # Store the next Hebrew date if applicable
-        if self._calendar_type == CALENDAR_TYPE_HEBREW and next_hdate:
-            self._next_hebrew_date = self._format_hebrew_date(next_hdate)
+    def calendar_days(self):
+        """Return the (Hebrew, month, day, half anniversary) days of the year the events of this sensor fall on."""
+        record = self._record
+        if not record.origin:
+            return ()
+        origin = date.fromordinal(record.origin)
+        spec = record.hebrew
+        if spec is not None:
+            days = [(True, spec.month, spec.day, False)]
         else:
-            self._next_hebrew_date = None
+            days = [(False, origin.month, origin.day, False)]
+        if record.flags & FLAG_HALF:
+            half = add_months(origin, 6)
+            days.append((False, half.month, half.day, True))
+        return days
+
+    def _update_calendar(self, next_date, changed=False):
+        """Keep this sensor's position in the calendar's date index, and drop its cached events if they changed."""
+        calendar_data = self.hass.data.get(DOMAIN, {}).get(CALENDAR_PLATFORM)
+        if calendar_data is not None:
+            calendar_data.update_entity(self.entity_id, next_date)
+            if changed:
+                calendar_data.invalidate_events(self.entity_id)
 
     async def async_added_to_hass(self):
         """Once the entity is added we should update to get the initial data loaded. Then add it to the Calendar."""
         await super().async_added_to_hass()
-        self.async_schedule_update_ha_state(True)
-        if DOMAIN not in self.hass.data:
-            self.hass.data[DOMAIN] = {}
-        if SENSOR_PLATFORM not in self.hass.data[DOMAIN]:
-            self.hass.data[DOMAIN][SENSOR_PLATFORM] = {}
-        self.hass.data[DOMAIN][SENSOR_PLATFORM][self.entity_id] = self
-
-        if CALENDAR_PLATFORM not in self.hass.data[DOMAIN]:
-            self.hass.data[DOMAIN][
-                CALENDAR_PLATFORM
-            ] = EntitiesCalendarData(self.hass)
-            _LOGGER.debug("Creating Anniversaries calendar")
-            self.hass.async_create_task(
-                async_load_platform(
+        with TRACER.span("add_sensor", "sensor", {"entity_id": self.entity_id}):
+            if DOMAIN not in self.hass.data:
+                self.hass.data[DOMAIN] = {}
+            if SENSOR_PLATFORM not in self.hass.data[DOMAIN]:
+                self.hass.data[DOMAIN][SENSOR_PLATFORM] = {}
+            self.hass.data[DOMAIN][SENSOR_PLATFORM][self.entity_id] = self
+
+            if CALENDAR_PLATFORM not in self.hass.data[DOMAIN]:
+                self.hass.data[DOMAIN][
+                    CALENDAR_PLATFORM
+                ] = EntitiesCalendarData(self.hass)
+                _LOGGER.debug("Creating Anniversaries calendar")
+                self.hass.async_create_task(
+                    async_load_platform(
+                        self.hass,
+                        CALENDAR_PLATFORM,
+                        DOMAIN,
+                        {"name": CALENDAR_NAME},
+                        {"name": CALENDAR_NAME},
+                    )
+                )
+            else:
+                _LOGGER.debug("Anniversaries calendar already exists")
+            self.hass.data[DOMAIN][CALENDAR_PLATFORM].add_entity(self.entity_id)
+            if self._record.flags & FLAG_TEMPLATE:
+                # Render now and again whenever an entity the template reads changes
+                self._template_info = async_track_template_result(
                     self.hass,
-                    CALENDAR_PLATFORM,
-                    DOMAIN,
-                    {"name": CALENDAR_NAME},
-                    {"name": CALENDAR_NAME},
+                    [TrackTemplate(templater.Template(self.config.get(CONF_DATE_TEMPLATE), self.hass), None)],
+                    self._async_template_changed,
                 )
-            )
+                self.async_on_remove(self._template_info.async_remove)
+                self._template_info.async_refresh()
+            async_get_coordinator(self.hass).async_add_entity(self)
+
+    @callback
+    def _async_template_changed(self, event, updates):
+        """Keep the new rendering of the date template and recalculate the sensor."""
+        result = updates.pop().result
+        if not isinstance(result, (str, TemplateError)):
+            # Only text can be a date, and lists or mappings cannot even be looked up in the parse cache
+            result = TemplateError(f"rendered {type(result).__name__} {result!r}, not a date string")
+        if isinstance(result, TemplateError):
+            error = str(result)
+            if error != self._template_error:
+                _LOGGER.error(
+                    f"{self.entity_id}: could not render date template {self.config.get(CONF_DATE_TEMPLATE)!r}: {error}"
+                )
+            self._template_error = error
+            self._template_result = None
+            TEMPLATE_RENDERS.inc("error")
         else:
-            _LOGGER.debug("Anniversaries calendar already exists")
-        self.hass.data[DOMAIN][CALENDAR_PLATFORM].add_entity(self.entity_id)
+            self._template_error = None
+            self._template_result = result
+            TEMPLATE_RENDERS.inc("ok")
+        async_get_coordinator(self.hass).async_refresh_entity(self)
 
     async def async_will_remove_from_hass(self):
         """When sensor is removed from hassio and there are no other sensors in the Anniversaries calendar, remove it."""
         await super().async_will_remove_from_hass()
-        _LOGGER.debug("Removing: %s" % (self._name))
+        _LOGGER.debug("Removing: %s" % (self.name))
+        async_get_coordinator(self.hass).async_remove_entity(self)
+        record = self._record
+        if record.row is not None:
+            async_get_engine(self.hass).remove(record.row)
+            record.row = None
         del self.hass.data[DOMAIN][SENSOR_PLATFORM][self.entity_id]
         self.hass.data[DOMAIN][CALENDAR_PLATFORM].remove_entity(self.entity_id)
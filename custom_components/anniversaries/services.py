@@ -0,0 +1,82 @@
+"""Services of the Anniversaries integration."""
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    CALENDAR_PLATFORM,
+    CALENDAR_TYPE_HEBREW,
+    CALENDAR_TYPE_OPTIONS,
+    CONF_CALENDAR_TYPE,
+    CONF_EVENT_TYPE,
+    DEFAULT_UPCOMING_COUNT,
+    DOMAIN,
+    EVENT_TYPE_OPTIONS,
+    MAX_UPCOMING_COUNT,
+    SERVICE_UPCOMING,
+)
+from .day_context import async_get_day_context
+
+ATTR_COUNT = "count"
+ATTR_DAYS = "days"
+
+UPCOMING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_COUNT, default=DEFAULT_UPCOMING_COUNT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_UPCOMING_COUNT)
+        ),
+        vol.Optional(ATTR_DAYS): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_EVENT_TYPE): vol.All(cv.ensure_list, [vol.In(EVENT_TYPE_OPTIONS)]),
+        vol.Optional(CONF_CALENDAR_TYPE): vol.All(cv.ensure_list, [vol.In(CALENDAR_TYPE_OPTIONS)]),
+    }
+)
+
+
+def _anniversary(entity, next_date, today) -> dict:
+    """Return the service response entry of one sensor's next anniversary."""
+    result = {
+        "entity_id": entity.entity_id,
+        "name": entity.name,
+        "date": next_date.isoformat(),
+        "days_remaining": (next_date - today).days,
+        "years": None if entity.unknown_year else entity.years_next,
+        "event_type": entity.event_type,
+        "calendar_type": entity.calendar_type,
+    }
+    if entity.calendar_type == CALENDAR_TYPE_HEBREW:
+        result["hebrew_date"] = entity.next_hebrew_date
+    return result
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    @callback
+    def _async_upcoming(call: ServiceCall) -> ServiceResponse:
+        """Return the next anniversaries of all sensors, nearest first, from the calendar's date index."""
+        calendar = hass.data.get(DOMAIN, {}).get(CALENDAR_PLATFORM)
+        if calendar is None:
+            return {"anniversaries": []}
+        today = async_get_day_context(hass).date
+        days = call.data.get(ATTR_DAYS)
+        event_types = call.data.get(CONF_EVENT_TYPE)
+        calendar_types = call.data.get(CONF_CALENDAR_TYPE)
+        count = call.data[ATTR_COUNT]
+        anniversaries = []
+        for next_date, entity in calendar.upcoming(today, today + timedelta(days=days) if days is not None else None):
+            if event_types is not None and entity.event_type not in event_types:
+                continue
+            if calendar_types is not None and entity.calendar_type not in calendar_types:
+                continue
+            anniversaries.append(_anniversary(entity, next_date, today))
+            if len(anniversaries) == count:
+                break
+        return {"anniversaries": anniversaries}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_UPCOMING, _async_upcoming, schema=UPCOMING_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
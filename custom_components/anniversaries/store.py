@@ -0,0 +1,99 @@
+"""Computed anniversary results saved across Home Assistant restarts."""
+from datetime import date
+import hashlib
+import json
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, VERSION
+from .engine import AnniversaryResult
+from .hebrew import HebrewDay
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.results"
+# Seconds to gather refreshes into a single write
+SAVE_DELAY = 60
+
+
+def config_hash(config) -> str:
+    """Return a hash of a sensor's configuration (and the integration version) that is stable across restarts."""
+    payload = json.dumps([VERSION, dict(config)], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+def _encode(result: AnniversaryResult) -> list:
+    """Return a result as plain JSON values, dates as ordinals."""
+    return [
+        result.date.toordinal(),
+        result.next_date.toordinal(),
+        result.days_remaining,
+        result.state,
+        result.years_next,
+        result.years_current,
+        result.weeks_remaining,
+        result.half_date.toordinal() if result.half_date is not None else None,
+        result.half_days_remaining,
+        list(result.next_hebrew_date) if result.next_hebrew_date is not None else None,
+    ]
+
+
+def _decode(values: list) -> AnniversaryResult:
+    """Rebuild a result saved by _encode."""
+    origin, next_date, days, state, years_next, years_current, weeks, half_date, half_days, hebrew = values
+    return AnniversaryResult(
+        date=date.fromordinal(origin),
+        next_date=date.fromordinal(next_date),
+        days_remaining=days,
+        state=state,
+        years_next=years_next,
+        years_current=years_current,
+        weeks_remaining=weeks,
+        half_date=date.fromordinal(half_date) if half_date is not None else None,
+        half_days_remaining=half_days,
+        next_hebrew_date=HebrewDay(*hebrew) if hebrew is not None else None,
+    )
+
+
+class ResultStore:
+    """Last results of every sensor, keyed by entity ID, configuration hash and the day they were computed for."""
+
+    __slots__ = "_store", "_entities", "_saved"
+
+    def __init__(self, hass: HomeAssistant, entities: dict) -> None:
+        """Initialize the store of the sensors in `entities` (entity ID to sensor)."""
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._entities = entities
+        self._saved: dict[str, list] = {}
+
+    async def async_load(self) -> bool:
+        """Load the results saved by the previous run, returning whether there are any."""
+        data = await self._store.async_load()
+        self._saved = data.get("results", {}) if isinstance(data, dict) else {}
+        return bool(self._saved)
+
+    def pop(self, entity_id: str, config_key: str, today: date) -> AnniversaryResult | None:
+        """Return (once) the saved result of a sensor, if it was computed today with the same configuration."""
+        entry = self._saved.pop(entity_id, None)
+        if entry is None or entry[0] != config_key or entry[1] != today.toordinal():
+            return None
+        try:
+            return _decode(entry[2:])
+        except (TypeError, ValueError):
+            return None
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the results of all sensors once refreshes have settled."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the results of the sensors that have one."""
+        results = {}
+        for entity_id, entity in self._entities.items():
+            saved = entity.saved_result()
+            if saved is not None:
+                config_key, day, result = saved
+                results[entity_id] = [config_key, day.toordinal(), *_encode(result)]
+        return {"results": results}
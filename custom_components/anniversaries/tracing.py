@@ -0,0 +1,134 @@
+"""Opt-in tracing of the startup phases, dumped as a Chrome trace.
+
+Spans are kept in a ring buffer, so a very large install keeps the most recent
+ones.  The dump opens in chrome://tracing or https://ui.perfetto.dev.
+"""
+from collections import deque
+import json
+import logging
+import os
+import threading
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.start import async_at_started
+
+_LOGGER = logging.getLogger(__name__)
+
+# Spans kept in the ring buffer, the oldest are dropped beyond this
+TRACE_BUFFER_SIZE = 200000
+TRACE_FILE = "anniversaries_trace.json"
+
+
+class _NullSpan:
+    """Span returned while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """A span being timed, recorded when it ends."""
+
+    __slots__ = "_tracer", "_name", "_category", "_args", "_start"
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: dict | None) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        end = time.perf_counter_ns()
+        self._tracer._events.append(
+            (self._name, self._category, self._start, end - self._start, threading.get_ident(), self._args)
+        )
+
+
+class Tracer:
+    """Records spans while enabled, `span()` is a shared no-op otherwise."""
+
+    __slots__ = "enabled", "_events", "_origin"
+
+    def __init__(self) -> None:
+        """Create a disabled tracer."""
+        self.enabled = False
+        self._events: deque = deque(maxlen=TRACE_BUFFER_SIZE)
+        self._origin = 0
+
+    def enable(self, size: int = TRACE_BUFFER_SIZE) -> None:
+        """Start recording into an empty ring buffer of `size` spans."""
+        self._events = deque(maxlen=size)
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording, the recorded spans are kept until the next enable()."""
+        self.enabled = False
+
+    def __len__(self) -> int:
+        """Return the number of recorded spans."""
+        return len(self._events)
+
+    def span(self, name: str, category: str, args: dict | None = None):
+        """Return a context manager timing one span."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def chrome_trace(self) -> dict:
+        """Return the recorded spans in the Chrome trace event format."""
+        pid = os.getpid()
+        events = []
+        for name, category, start, duration, thread, args in list(self._events):
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": thread,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        """Write the recorded spans to a Chrome trace file. Blocking, run it in the executor once disabled."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+
+TRACER = Tracer()
+
+
+@callback
+def async_trace_startup(hass: HomeAssistant) -> None:
+    """Trace the setup of the integration until Home Assistant has started, then write the trace file."""
+    TRACER.enable()
+
+    async def _async_dump(hass: HomeAssistant) -> None:
+        TRACER.disable()
+        path = hass.config.path(TRACE_FILE)
+        try:
+            await hass.async_add_executor_job(TRACER.write, path)
+        except OSError as err:
+            _LOGGER.error(f"Could not write the startup trace to {path}: {err}")
+            return
+        _LOGGER.info(f"Startup trace of {len(TRACER)} spans written to {path}")
+
+    async_at_started(hass, _async_dump)
@@ -0,0 +1,105 @@
+"""HTTP views of the Anniversaries integration."""
+from datetime import date
+from http import HTTPStatus
+import secrets
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .const import CALENDAR_PLATFORM, DOMAIN, SENSOR_PLATFORM
+from .feed import entity_events, feed_footer, feed_header, format_stamp
+from .metrics import render_text
+
+METRICS_URL = "/api/anniversaries/metrics"
+FEED_URL = "/api/anniversaries/anniversaries.ics"
+
+# Years in the feed when the request does not give an end year, from the start year
+DEFAULT_FEED_YEARS = 3
+MAX_FEED_YEARS = 100
+# Events written to the response at a time
+FEED_CHUNK_EVENTS = 500
+# Changes on every restart, so a feed is never matched against one built by another run
+_FEED_TOKEN = secrets.token_hex(4)
+
+
+class AnniversariesMetricsView(HomeAssistantView):
+    """Hot-path metrics in the Prometheus text exposition format."""
+
+    url = METRICS_URL
+    name = "api:anniversaries:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the current metrics."""
+        hass: HomeAssistant = request.app["hass"]
+        return web.Response(text=render_text(hass), content_type="text/plain", charset="utf-8")
+
+
+class AnniversariesFeedView(HomeAssistantView):
+    """Every anniversary as an iCalendar feed, streamed one batch of events at a time."""
+
+    url = FEED_URL
+    name = "api:anniversaries:feed"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.StreamResponse:
+        """Return the feed for ?start_year=...&end_year=..., or 304 if the client already has it."""
+        hass: HomeAssistant = request.app["hass"]
+        this_year = dt_util.now().year
+        try:
+            start_year = int(request.query.get("start_year", this_year))
+            end_year = int(request.query.get("end_year", start_year + DEFAULT_FEED_YEARS - 1))
+        except ValueError:
+            return self.json_message("start_year and end_year must be years", HTTPStatus.BAD_REQUEST)
+        if not 1 <= start_year <= end_year < 9999 or end_year - start_year >= MAX_FEED_YEARS:
+            return self.json_message(
+                f"The feed covers 1 to {MAX_FEED_YEARS} years from start_year to end_year", HTTPStatus.BAD_REQUEST
+            )
+
+        calendar = hass.data.get(DOMAIN, {}).get(CALENDAR_PLATFORM)
+        revision = calendar.revision if calendar is not None else 0
+        etag = f'"{_FEED_TOKEN}-{revision}-{start_year}-{end_year}"'
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH, "")
+        if if_none_match == "*" or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers={hdrs.ETAG: etag})
+
+        response = web.StreamResponse(
+            headers={
+                hdrs.CONTENT_TYPE: "text/calendar; charset=utf-8",
+                hdrs.CONTENT_DISPOSITION: 'attachment; filename="anniversaries.ics"',
+                hdrs.ETAG: etag,
+                hdrs.CACHE_CONTROL: "no-cache",
+            }
+        )
+        await response.prepare(request)
+        await response.write(feed_header().encode())
+        if calendar is not None:
+            first, last = date(start_year, 1, 1), date(end_year, 12, 31)
+            stamp = format_stamp(calendar.revised_at)
+            sensors = hass.data[DOMAIN].get(SENSOR_PLATFORM, {})
+            chunk = []
+            # Sensors may come and go while the feed is written
+            for entity_id in list(calendar.entities):
+                entity = sensors.get(entity_id)
+                if not entity or not entity.name or not entity.valid:
+                    continue
+                chunk.extend(entity_events(entity, first, last, stamp))
+                if len(chunk) >= FEED_CHUNK_EVENTS:
+                    await response.write("".join(chunk).encode())
+                    chunk = []
+            if chunk:
+                await response.write("".join(chunk).encode())
+        await response.write(feed_footer().encode())
+        await response.write_eof()
+        return response
+
+
+@callback
+def async_register_views(hass: HomeAssistant) -> None:
+    """Register the integration's views, when the HTTP server is set up."""
+    if getattr(hass, "http", None) is not None:
+        hass.http.register_view(AnniversariesMetricsView())
+        hass.http.register_view(AnniversariesFeedView())
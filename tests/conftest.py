@@ -0,0 +1,6 @@
+"""Make the integration and the benchmark helpers importable from the tests."""
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "benchmarks")]
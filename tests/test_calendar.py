@@ -0,0 +1,107 @@
+"""Calendar queries on a stub Home Assistant, as in benchmarks/suite.py."""
+import asyncio
+from datetime import date, datetime, timedelta
+from itertools import takewhile
+import random
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.anniversaries.calendar import HALF_ANNIVERSARY_SUMMARY, EntitiesCalendarData  # noqa: E402
+from custom_components.anniversaries.const import CALENDAR_PLATFORM, DOMAIN, SENSOR_SCHEMA  # noqa: E402
+from custom_components.anniversaries.sensor import anniversaries  # noqa: E402
+
+DATES = [
+    "1985-08-20",
+    "03-15",
+    "12-31",
+    "01-01",
+    "2000-02-29",
+    "1999-08-31",
+    "2024-05-01",
+    "10 Nisan 5750",
+    "1 Tishrei",
+    "29 Elul",
+    "30 Cheshvan 5783",
+    "30 Kislev 5760",
+    "15 Adar 5783",
+    "30 Adar I",
+    "2 Adar II",
+    "29 Shevat",
+]
+
+
+def _configs(shift=0):
+    for index in range(len(DATES)):
+        value = DATES[(index + shift) % len(DATES)]
+        config = {"name": f"a{index}", "date": value, "show_half_anniversary": index % 2 == 0}
+        if value[0].isdigit() and " " in value:
+            config["calendar_type"] = "hebrew"
+        if value == "2024-05-01":
+            config["one_time"] = True
+        yield config
+
+
+def _windows():
+    """Return a reproducible set of (start, end) query windows, mostly shorter than a year."""
+    rng = random.Random(7)
+    windows = []
+    for _ in range(400):
+        start = date(1995, 1, 1) + timedelta(days=rng.randrange(90 * 365))
+        windows.append((start, start + timedelta(days=rng.choice([0, 1, 6, 30, 31, 90, 200, 352, 360, 364, 365]))))
+    return windows
+
+
+def test_window_events():
+    """A query returns every occurrence in the window, whichever entities the day index picks."""
+
+    async def run():
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            calendar = hass.data.setdefault(DOMAIN, {})[CALENDAR_PLATFORM] = EntitiesCalendarData(hass)
+            sensors = []
+            for config in _configs():
+                sensor = anniversaries(hass, SENSOR_SCHEMA(config))
+                sensor.hass = hass
+                sensor.async_write_ha_state = lambda: None
+                await sensor.async_added_to_hass()
+                sensors.append(sensor)
+            await hass.async_block_till_done()
+            assert all(sensor.valid for sensor in sensors), [sensor.name for sensor in sensors if not sensor.valid]
+
+            async def check(windows):
+                for start, end in windows:
+                    expected = []
+                    for sensor in sensors:
+                        for occurrences, summary in (
+                            (sensor.occurrences, sensor.name),
+                            (sensor.half_occurrences, HALF_ANNIVERSARY_SUMMARY.format(sensor.name)),
+                        ):
+                            expected.extend((day, summary) for day in takewhile(lambda day: day <= end, occurrences(start)))
+                    events = await calendar.async_get_events(
+                        hass,
+                        datetime(start.year, start.month, start.day, tzinfo=dt_util.UTC),
+                        datetime(end.year, end.month, end.day, tzinfo=dt_util.UTC),
+                    )
+                    assert sorted((event.start, event.summary) for event in events) == sorted(expected), (start, end)
+
+            await check(_windows())
+            # Entities whose date changed move in the index
+            for sensor, config in list(zip(sensors, _configs(7)))[:2]:
+                assert sensor.async_reconfigure(SENSOR_SCHEMA(config))
+            await hass.async_block_till_done()
+            await check(_windows()[:100])
+
+            for sensor in sensors:
+                await sensor.async_will_remove_from_hass()
+            await hass.async_stop()
+
+    now = datetime(2024, 3, 10, 12, tzinfo=dt_util.UTC)
+    with patch.object(dt_util, "now", lambda time_zone=None: now):
+        asyncio.run(run())
@@ -0,0 +1,86 @@
+"""Differential test of the native Hebrew calendar against hdate.
+
+benchmarks/hebcal.py runs the same comparison over the whole calendar.
+"""
+from datetime import date
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("hdate")
+
+from hdate import HebrewDate  # noqa: E402
+from hdate.hebrew_date import is_leap_year  # noqa: E402
+
+# hebcal is self-contained, load it without importing Home Assistant
+_SPEC = importlib.util.spec_from_file_location(
+    "hebcal",
+    Path(__file__).resolve().parent.parent / "custom_components" / "anniversaries" / "hebcal.py",
+)
+hebcal = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(hebcal)
+
+# The first years, the years anniversaries fall in and the far future, each at least a full 19-year cycle
+YEAR_RANGES = [(3762, 3781), (5700, 5800), (6981, 7000)]
+
+
+def _ordinal_or_none(convert, year, month, day):
+    """Return the Gregorian ordinal of a Hebrew date, None if it does not exist."""
+    try:
+        return convert(year, month, day)
+    except ValueError:
+        return None
+
+
+def _hdate_ordinal(year, month, day):
+    return HebrewDate(year=year, month=month, day=day).to_gdate().toordinal()
+
+
+@pytest.mark.parametrize(("start", "end"), YEAR_RANGES)
+def test_year_structure(start, end):
+    """Leap years, year lengths and every month's days (including invalid ones) match hdate."""
+    for year in range(start, end):
+        assert hebcal.is_leap_year(year) == is_leap_year(year), year
+        assert hebcal.year_length(year) == HebrewDate.year_size(year), year
+        for month in range(1, 15):
+            for day in (1, 29, 30, 31):
+                assert _ordinal_or_none(hebcal.to_ordinal, year, month, day) == _ordinal_or_none(
+                    _hdate_ordinal, year, month, day
+                ), (year, month, day)
+
+
+@pytest.mark.parametrize(("start", "end"), YEAR_RANGES)
+def test_from_ordinal(start, end):
+    """Every day of each year converts to the same Hebrew date as hdate."""
+    for year in range(start, end):
+        first = hebcal.rosh_hashana(year)
+        for ordinal in range(first, first + hebcal.year_length(year)):
+            expected = HebrewDate.from_gdate(date.fromordinal(ordinal))
+            assert hebcal.from_ordinal(ordinal) == (expected.year, int(expected.month), expected.day), ordinal
+
+
+def test_hebrew_engines():
+    """The sensors' conversions and anniversaries are the same with the native and the hdate engine."""
+    pytest.importorskip("homeassistant")
+    from custom_components.anniversaries import hebrew
+    from custom_components.anniversaries.const import HEBREW_ENGINE_HDATE, HEBREW_ENGINE_NATIVE
+
+    first = date(2019, 9, 1).toordinal()
+    references = range(first, first + 20 * 365, 53)
+
+    def calculate():
+        results = [hebrew.ordinal_to_hebrew(ordinal) for ordinal in references]
+        for month in range(1, 15):
+            for day in (1, 15, 29, 30):
+                results.extend(hebrew.next_hebrew_occurrence(day, month, ordinal) for ordinal in references)
+        return results
+
+    assert hebrew.import_hdate()
+    try:
+        hebrew.set_engine(HEBREW_ENGINE_NATIVE)
+        native = calculate()
+        hebrew.set_engine(HEBREW_ENGINE_HDATE)
+        assert calculate() == native
+    finally:
+        hebrew.set_engine(HEBREW_ENGINE_NATIVE)
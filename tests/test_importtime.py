@@ -0,0 +1,15 @@
+"""Import time of the integration, against the budget of benchmarks/importtime.py."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from importtime import DEFAULT_BUDGET_MS, measure  # noqa: E402
+
+
+def test_import_time_budget():
+    """The integration imports within the budget, without hdate or dateutil."""
+    times, loaded = measure()
+    total_ms = sum(times.values()) / 1000
+    assert total_ms <= DEFAULT_BUDGET_MS, f"import time {total_ms:.1f} ms is over the {DEFAULT_BUDGET_MS} ms budget"
+    assert not loaded["hdate"], "hdate is imported with the integration"
+    assert not loaded["dateutil"], "dateutil is imported with the integration"
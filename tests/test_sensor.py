@@ -0,0 +1,135 @@
+"""Sensor calculations on a stub Home Assistant, as in benchmarks/suite.py."""
+import asyncio
+from datetime import date, datetime, timedelta
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.anniversaries.calendar import EntitiesCalendarData  # noqa: E402
+from custom_components.anniversaries.const import CALENDAR_PLATFORM, DOMAIN, SENSOR_SCHEMA  # noqa: E402
+from custom_components.anniversaries.sensor import anniversaries  # noqa: E402
+
+CONFIGS = [
+    {"name": "known", "date": "1985-08-20", "show_half_anniversary": True},
+    {"name": "yearless", "date": "03-15", "show_half_anniversary": True},
+    {"name": "leap day", "date": "2000-02-29", "show_half_anniversary": True},
+    {"name": "one time", "date": "2024-05-01", "one_time": True, "show_half_anniversary": True},
+    {"name": "count up", "date": "2010-11-30", "count_up": True, "show_half_anniversary": True},
+    {"name": "hebrew", "date": "10 Nisan 5750", "calendar_type": "hebrew", "show_half_anniversary": True},
+    {"name": "hebrew yearless", "date": "1 Tishrei", "calendar_type": "hebrew", "show_half_anniversary": True},
+    {"name": "adar", "date": "2 Adar II", "calendar_type": "hebrew", "show_half_anniversary": True},
+]
+
+# Days to restore on, each followed by recalculations over the next two years
+DAYS = [date(2023, 3, 17), date(2023, 9, 28), date(2024, 2, 29), date(2024, 12, 31)]
+LATER = [0, 1, 60, 183, 365, 500, 730]
+
+
+def _run(test):
+    """Run test(hass, calculate) on a fresh stub Home Assistant."""
+
+    async def run():
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            hass.data.setdefault(DOMAIN, {})[CALENDAR_PLATFORM] = EntitiesCalendarData(hass)
+            now = [None]
+
+            def calculate(sensor, today):
+                """Calculate the sensor on a local date, returning its state and attributes."""
+                now[0] = datetime(today.year, today.month, today.day, 12, tzinfo=dt_util.UTC)
+                sensor.prepare()
+                sensor.calculate()
+                return sensor.state, dict(sensor.extra_state_attributes)
+
+            with patch.object(dt_util, "now", lambda time_zone=None: now[0]):
+                test(hass, calculate)
+
+    asyncio.run(run())
+
+
+def _sensor(hass, config, index):
+    sensor = anniversaries(hass, SENSOR_SCHEMA(config))
+    sensor.hass = hass
+    sensor.entity_id = f"sensor.test_{index}"
+    return sensor
+
+
+def _fresh(config, days):
+    """Return the results of a new sensor calculated on each day."""
+    results = []
+
+    def test(hass, calculate):
+        for index, today in enumerate(days):
+            results.append(calculate(_sensor(hass, config, index), today))
+
+    _run(test)
+    return results
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=[config["name"] for config in CONFIGS])
+@pytest.mark.parametrize("day", DAYS, ids=str)
+def test_restore_then_calculate(config, day):
+    """A result saved and restored on the next start is recalculated as if never saved."""
+    days = [day + timedelta(days=later) for later in LATER]
+    saved = []
+    restored = []
+
+    def save(hass, calculate):
+        sensor = _sensor(hass, config, 0)
+        calculate(sensor, day)
+        saved.append(sensor.saved_result())
+
+    def restore(hass, calculate):
+        sensor = _sensor(hass, config, 0)
+        _, saved_day, result = saved[0]
+        assert sensor.restore(result, saved_day)
+        restored.extend(calculate(sensor, today) for today in days)
+
+    _run(save)
+    _run(restore)
+    assert restored == _fresh(config, days)
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=[config["name"] for config in CONFIGS])
+def test_half_occurrences(config):
+    """The calendar's next half anniversary is the one the sensor shows, day after day."""
+    first = date(2023, 1, 1)
+    shown = []
+    expanded = []
+
+    def test(hass, calculate):
+        sensor = _sensor(hass, config, 0)
+        for later in range(0, 3 * 365, 5):
+            today = first + timedelta(days=later)
+            shown.append(calculate(sensor, today)[1]["half_anniversary_date"])
+            expanded.append(next(sensor.half_occurrences(today)).isoformat())
+
+    _run(test)
+    assert expanded == shown
+
+
+@pytest.mark.parametrize("template", ["{{ [2024, 1, 1] }}", "{{ {'date': '2024-01-01'} }}", "{{ 20240101 }}"])
+def test_template_not_a_string(template):
+    """A template that does not render text is an invalid template."""
+
+    async def run():
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            hass.data.setdefault(DOMAIN, {})[CALENDAR_PLATFORM] = EntitiesCalendarData(hass)
+            sensor = _sensor(hass, {"name": "template", "date_template": template}, 0)
+            sensor.async_write_ha_state = lambda: None
+            await sensor.async_added_to_hass()
+            await hass.async_block_till_done()
+            assert sensor.state == "Invalid Template"
+            assert "not a date string" in sensor.extra_state_attributes["template_error"]
+            await sensor.async_will_remove_from_hass()
+            await hass.async_stop()
+
+    with patch.object(dt_util, "now", lambda time_zone=None: datetime(2024, 3, 10, 12, tzinfo=dt_util.UTC)):
+        asyncio.run(run())